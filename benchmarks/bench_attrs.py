@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark changing the attributes of tags.
+
+Times adding many classes and styles to a tag one at a time (as component libraries do
+while building a page), and checking for and removing classes. Also compares
+consolidate_attrs() (which component constructors use to split their arguments into
+attributes and children) with the previous implementation, which built a Tag from all
+of the arguments and read its attributes.
+
+Usage: python benchmarks/bench_attrs.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Callable
+
+from htmltools import Tag, TagAttrs, TagChild, consolidate_attrs, tags
+
+N = 200
+
+
+def add_classes() -> None:
+    x = tags.div(class_="card")
+    for i in range(N):
+        x.add_class(f"c{i}")
+        x.add_class("shadow")
+    for i in range(N):
+        x.has_class(f"c{i}")
+
+
+def remove_classes() -> None:
+    x = tags.div(class_=" ".join(f"c{i}" for i in range(N)))
+    for i in range(N):
+        x.remove_class(f"c{i}")
+
+
+def add_styles() -> None:
+    x = tags.div(style="display:flex;")
+    for i in range(N):
+        x.add_style(f"--v{i % 20}: {i}px;")
+
+
+def consolidate_attrs_tag(
+    *args: TagChild | TagAttrs, **kwargs: str
+) -> tuple[TagAttrs, list[TagChild]]:
+    # The previous implementation of consolidate_attrs()
+    tag = Tag("consolidate_attrs", *args, **kwargs)
+    attrs = dict(tag.attrs)
+    children = [child for child in args if not isinstance(child, dict)]
+    return (attrs, children)  # pyright: ignore[reportReturnType]
+
+
+CHILDREN = [tags.div(tags.span(f"item {i}")) for i in range(N)]
+ATTRS: TagAttrs = {"class": "card", "id": "panel"}
+
+
+CASES: dict[str, Callable[[], object]] = {
+    f"add_class() + has_class() x{N}": add_classes,
+    f"remove_class() x{N}": remove_classes,
+    f"add_style() x{N}": add_styles,
+    f"consolidate_attrs_tag() {N} kids": lambda: [
+        consolidate_attrs_tag(ATTRS, *CHILDREN, class_="shadow") for _ in range(10)
+    ],
+    f"consolidate_attrs() {N} kids": lambda: [
+        consolidate_attrs(ATTRS, *CHILDREN, class_="shadow") for _ in range(10)
+    ],
+}
+
+
+def bench(fn: Callable[[], object], number: int = 20) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    for label, fn in CASES.items():
+        print(f"{label:<34}{bench(fn) * 1e3:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark constructing tags with the functions in htmltools.tags.
+
+Reports how many tags per second can be built with no arguments, with children only,
+with keyword attributes, with a dict of attributes, and with nested lists of children.
+
+Usage: python benchmarks/bench_construct.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Callable
+
+from htmltools import tags
+
+CHILD = tags.span("child")
+
+CASES: dict[str, Callable[[], object]] = {
+    "div()": lambda: tags.div(),
+    "div(str, Tag)": lambda: tags.div("text", CHILD),
+    "div(str, id=, class_=)": lambda: tags.div("text", id="x", class_="card"),
+    "div({id:}, str)": lambda: tags.div({"id": "x"}, "text"),
+    "div(str, data_*=, True)": lambda: tags.div(
+        "text", data_value="1", data_toggle="tab", hidden=True
+    ),
+    "input(8 attributes)": lambda: tags.input(
+        type_="checkbox",
+        name="opt",
+        value=1,
+        class_="form-check-input",
+        aria_label="Option",
+        data_bs_toggle="tooltip",
+        data_row_id="17",
+        checked=True,
+    ),
+    "div([str, [Tag, None]], 1)": lambda: tags.div(["text", [CHILD, None]], 1),
+}
+
+
+def bench(fn: Callable[[], object], number: int = 100_000) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=7)) / number
+
+
+def main() -> None:
+    print(f"{'':<30}{'time':>12}{'tags/sec':>14}")
+    for label, fn in CASES.items():
+        t = bench(fn)
+        print(f"{label:<30}{t * 1e6:>9.2f} us{1 / t:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark building CSS style declarations, as for the cells of a heatmap table.
+
+Compares css() with the implementation it replaced (which converted each property name
+with two re.sub() calls, and built the result with +=), and with Style. Also compares
+adding the styles to tags as strings and as Style objects.
+
+Usage: python benchmarks/bench_css.py
+"""
+
+from __future__ import annotations
+
+import re
+import timeit
+from typing import Callable
+
+from htmltools import Style, css, tags
+
+
+def css_regex(collapse_: str = "", **kwargs: str | float | None) -> str | None:
+    # The previous implementation of css()
+    res = ""
+    for k, v in kwargs.items():
+        if v is None:
+            continue
+        v = " ".join(v) if isinstance(v, list) else str(v)
+        k = re.sub("_", "-", re.sub("([A-Z])", "-\\1", k).lower())
+        res += k + ":" + v + ";" + collapse_
+    return None if res == "" else res
+
+
+N = 1_000
+COLORS = [f"#{i % 256:02x}{(i * 7) % 256:02x}80" for i in range(N)]
+
+
+def cells(make_style: Callable[[str], object]) -> None:
+    for color in COLORS:
+        make_style(color)
+
+
+def styled_cells(make_style: Callable[[str], str | Style]) -> None:
+    for color in COLORS:
+        tags.td("1.0", style="text-align:right;").add_style(make_style(color))
+
+
+CASES: dict[str, Callable[[], object]] = {
+    "css_regex() (previous)": lambda: cells(
+        lambda c: css_regex(backgroundColor=c, font_weight="bold", padding="2px")
+    ),
+    "css()": lambda: cells(
+        lambda c: css(backgroundColor=c, font_weight="bold", padding="2px")
+    ),
+    "Style()": lambda: cells(
+        lambda c: Style(backgroundColor=c, font_weight="bold", padding="2px")
+    ),
+    "td().add_style(css_regex())": lambda: styled_cells(
+        lambda c: css_regex(backgroundColor=c, font_weight="bold") or ""
+    ),
+    "td().add_style(css())": lambda: styled_cells(
+        lambda c: css(backgroundColor=c, font_weight="bold") or ""
+    ),
+    "td().add_style(Style())": lambda: styled_cells(
+        lambda c: Style(backgroundColor=c, font_weight="bold")
+    ),
+}
+
+
+def bench(fn: Callable[[], object], number: int = 5) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    print(f"{N} cells")
+    for label, fn in CASES.items():
+        print(f"{label:<30}{bench(fn) * 1e3:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark checking what kind of tag node an object is.
+
+Compares isinstance() checks against the runtime_checkable Protocols Tagifiable and
+ReprHtml (which htmltools used to make for every child when constructing, tagifying,
+and rendering tags) with isinstance() checks against classes, and with the per-type
+cache that htmltools now uses (_node_kind()). Also times building, tagifying, and
+rendering a table, for reference.
+
+Usage: python benchmarks/bench_dispatch.py
+"""
+
+from __future__ import annotations
+
+import timeit
+from typing import Callable
+
+from htmltools import HTML, ReprHtml, Tag, Tagifiable, TagList, tags
+from htmltools._core import _KIND_TAGIFIABLE, _node_kind
+
+OBJECTS: dict[str, object] = {
+    "str": "text",
+    "HTML": HTML("<b>html</b>"),
+    "Tag": tags.div(),
+}
+
+CHECKS: dict[str, Callable[[object], object]] = {
+    "isinstance(x, Tagifiable)": lambda x: isinstance(x, Tagifiable),
+    "isinstance(x, ReprHtml)": lambda x: isinstance(x, ReprHtml),
+    "isinstance(x, Tag)": lambda x: isinstance(x, Tag),
+    "_node_kind(x)": lambda x: _node_kind(x) & _KIND_TAGIFIABLE,
+}
+
+
+def bench(fn: Callable[[], object], number: int = 100_000) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def make_table(n_rows: int, n_cols: int = 10) -> Tag:
+    return tags.table(
+        tags.tbody(
+            *[
+                tags.tr(*[tags.td(f"r{i}c{j}") for j in range(n_cols)])
+                for i in range(n_rows)
+            ]
+        )
+    )
+
+
+def main() -> None:
+    print(f"{'':<28}" + "".join(f"{label:>12}" for label in OBJECTS))
+    for name, check in CHECKS.items():
+        times = [bench(lambda: check(x)) for x in OBJECTS.values()]
+        print(f"{name:<28}" + "".join(f"{t * 1e9:>9.0f} ns" for t in times))
+
+    print()
+    x = make_table(1_000)
+    for label, fn in (
+        ("build table", lambda: make_table(1_000)),
+        ("tagify table", x.tagify),
+        ("render table", lambda: TagList(x).render()),
+    ):
+        print(f"{label:<28}{bench(fn, number=1) * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for HTML escaping.
+
+Times the escaping function for each context on short, long, and escape-heavy strings,
+and compares the text and attribute escapers with the regex-based implementation that
+html_escape() used before (equivalent to it, rather than the exact code). Also compares
+escaping a large column of strings one at a time with escaping it as a batch.
+
+Usage: python benchmarks/bench_escape.py
+"""
+
+from __future__ import annotations
+
+import re
+import timeit
+from typing import Callable
+
+from htmltools._escape import (
+    escape_attr,
+    escape_many,
+    escape_script,
+    escape_style,
+    escape_text,
+    escape_url_attr,
+)
+
+# Reference implementation ------------------------------------------------------------
+
+TEXT_TABLE = {"&": "&amp;", ">": "&gt;", "<": "&lt;"}
+ATTR_TABLE = {
+    **TEXT_TABLE,
+    '"': "&quot;",
+    "'": "&apos;",
+    "\r": "&#13;",
+    "\n": "&#10;",
+}
+
+
+def regex_escape(text: str, attr: bool = False) -> str:
+    table = ATTR_TABLE if attr else TEXT_TABLE
+    if not re.search("|".join(table), text):
+        return text
+    for key, value in table.items():
+        text = text.replace(key, value)
+    return text
+
+
+# Benchmarks --------------------------------------------------------------------------
+
+INPUTS = {
+    "short": "col-sm-6",
+    "short, escaped": "a < b",
+    "long": "The quick brown fox jumps over the lazy dog. " * 100,
+    "long, escaped at end": "The quick brown fox jumps over the lazy dog. " * 100 + "&",
+    "escape-heavy": "<a href=\"x\">'&'</a>\n" * 100,
+}
+
+ESCAPERS: dict[str, Callable[[str], str]] = {
+    "text (regex)": regex_escape,
+    "text": escape_text,
+    "attr (regex)": lambda s: regex_escape(s, attr=True),
+    "attr": escape_attr,
+    "url": escape_url_attr,
+    "script": escape_script,
+    "style": escape_style,
+}
+
+
+def bench(fn: Callable[[str], str], s: str, number: int = 1_000) -> float:
+    return min(timeit.repeat(lambda: fn(s), number=number, repeat=5)) / number
+
+
+COLUMNS = {
+    "plain column": [f"row {i}" for i in range(10_000)],
+    "escaped column": [f"<row {i} & more>" for i in range(10_000)],
+}
+
+
+def bench_column(fn: Callable[[list[str]], list[str]], x: list[str]) -> float:
+    return min(timeit.repeat(lambda: fn(x), number=10, repeat=5)) / 10
+
+
+def main() -> None:
+    print(f"{'':<14}" + "".join(f"{label:>22}" for label in INPUTS))
+    for name, fn in ESCAPERS.items():
+        times = [bench(fn, s) for s in INPUTS.values()]
+        print(f"{name:<14}" + "".join(f"{t * 1e9:>19.0f} ns" for t in times))
+
+    print()
+    print(f"{'':<14}" + "".join(f"{label:>22}" for label in COLUMNS))
+    column_escapers: dict[str, Callable[[list[str]], list[str]]] = {
+        "text, each": lambda x: [escape_text(s) for s in x],
+        "text, batch": lambda x: escape_many(x, escape_text),
+        "attr, each": lambda x: [escape_attr(s) for s in x],
+        "attr, batch": lambda x: escape_many(x, escape_attr),
+    }
+    for name, fn in column_escapers.items():
+        times = [bench_column(fn, x) for x in COLUMNS.values()]
+        print(f"{name:<14}" + "".join(f"{t * 1e6:>19.0f} us" for t in times))
+
+
+if __name__ == "__main__":
+    main()
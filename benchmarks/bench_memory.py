@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory used by Tag trees.
+
+Builds trees of different shapes and reports the memory they use (as measured by
+tracemalloc, so including the attribute dicts, child lists, and strings of each tag)
+per node.
+
+Usage: python benchmarks/bench_memory.py
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from typing import Callable
+
+from htmltools import HTML, Tag, TagList, tags
+
+
+def leaves(n: int) -> Tag:
+    return tags.div(*[tags.br() for _ in range(n)])
+
+
+def rows(n: int) -> Tag:
+    return tags.table(
+        tags.tbody(
+            *[
+                tags.tr(
+                    tags.td(f"r{i}", class_="cell"),
+                    tags.td(tags.span("label", class_="label"), HTML("<b>x</b>")),
+                    id=f"row-{i}",
+                )
+                for i in range(n // 5)
+            ]
+        )
+    )
+
+
+def count_nodes(x: Tag | TagList) -> int:
+    n = 0
+    stack: list[object] = [x]
+    while stack:
+        node = stack.pop()
+        n += 1
+        if isinstance(node, Tag):
+            stack.extend(node.children)
+        elif isinstance(node, TagList):
+            stack.extend(node)
+    return n
+
+
+def bench(label: str, build: Callable[[int], Tag], n: int = 100_000) -> None:
+    tracemalloc.start()
+    x = build(n)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    n_nodes = count_nodes(x)
+    print(
+        f"{label:<20} {n_nodes:>9} nodes {size / 1e6:>8.1f} MB {size / n_nodes:>6.0f} B/node"
+    )
+
+
+def main() -> None:
+    bench("empty leaf tags", leaves)
+    bench("table rows", rows)
+
+
+if __name__ == "__main__":
+    main()
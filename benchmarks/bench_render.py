@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML serialization of Tag trees.
+
+Renders tables of increasing size (and a deeply nested tree) and reports the time per
+node. For a linear-time serializer, the time per node should stay roughly constant as
+the number of nodes grows.
+
+The HTML for each tag's attributes is cached until they change, so the time to render
+a table again is also compared with the time when all of its attributes have changed.
+
+Usage: python benchmarks/bench_render.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+
+from htmltools import Tag, TagList, tags
+
+
+def make_table(n_rows: int, n_cols: int = 10) -> Tag:
+    return tags.table(
+        tags.thead(tags.tr(*[tags.th(f"col{j}") for j in range(n_cols)])),
+        tags.tbody(
+            *[
+                tags.tr(*[tags.td(f"r{i}c{j}", class_="cell") for j in range(n_cols)])
+                for i in range(n_rows)
+            ]
+        ),
+        class_="table",
+    )
+
+
+def make_nested(depth: int) -> Tag:
+    x = tags.div("leaf")
+    for _ in range(depth):
+        x = tags.div(x, tags.span("sibling"))
+    return x
+
+
+def count_nodes(x: Tag | TagList) -> int:
+    n = 0
+    stack: list[object] = [x]
+    while stack:
+        node = stack.pop()
+        n += 1
+        if isinstance(node, Tag):
+            stack.extend(node.children)
+        elif isinstance(node, TagList):
+            stack.extend(node)
+    return n
+
+
+def clear_attrs_html(x: Tag | TagList) -> None:
+    stack: list[object] = [x]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, Tag):
+            node.attrs._changed()  # pyright: ignore[reportPrivateUsage]
+            stack.extend(node.children)
+        elif isinstance(node, TagList):
+            stack.extend(node)
+
+
+def bench(label: str, x: Tag, number: int = 5, attrs_changed: bool = False) -> None:
+    x = x.tagify()
+    n = count_nodes(x)
+    setup = (lambda: clear_attrs_html(x)) if attrs_changed else "pass"
+    secs = min(timeit.repeat(x.get_html_string, setup, number=1, repeat=number))
+    print(
+        f"{label:<28} {n:>9} nodes {secs * 1e3:>10.2f} ms {secs / n * 1e9:>8.0f} ns/node"
+    )
+
+
+def main() -> None:
+    for n_rows in (100, 1_000, 10_000):
+        bench(f"table {n_rows} rows", make_table(n_rows))
+    bench("table 10000 rows, new attrs", make_table(10_000), attrs_changed=True)
+
+    # Deep trees are limited by the recursion limit of the serializer.
+    limit = sys.getrecursionlimit()
+    for depth in (50, 200, limit // 4):
+        bench(f"nested depth {depth}", make_nested(depth))
+
+
+if __name__ == "__main__":
+    main()
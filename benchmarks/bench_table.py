@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark building and rendering large tables.
+
+Compares a table built from tags.tr() and tags.td() with the same table built by
+table_from_columns(), which writes the rows without creating a Tag for each cell.
+
+Usage: python benchmarks/bench_table.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from htmltools import Tag, table_from_columns, tags
+
+
+def make_data(n_rows: int, n_cols: int = 10) -> dict[str, list[str]]:
+    return {f"col{j}": [f"r{i}c{j}" for i in range(n_rows)] for j in range(n_cols)}
+
+
+def tags_table(data: dict[str, list[str]]) -> Tag:
+    return tags.table(
+        tags.thead(tags.tr(*[tags.th(name) for name in data])),
+        tags.tbody(
+            *[tags.tr(*[tags.td(x) for x in row]) for row in zip(*data.values())]
+        ),
+    )
+
+
+def bench(label: str, n_cells: int, fn: object) -> None:
+    secs = min(timeit.repeat(fn, number=1, repeat=5))  # type: ignore[arg-type]
+    print(f"{label:<32} {secs * 1e3:>10.2f} ms {secs / n_cells * 1e9:>8.0f} ns/cell")
+
+
+def main() -> None:
+    for n_rows in (1_000, 10_000):
+        data = make_data(n_rows)
+        n_cells = n_rows * len(data)
+        bench(f"tags, {n_cells} cells", n_cells, lambda: str(tags_table(data)))
+        bench(
+            f"table_from_columns, {n_cells} cells",
+            n_cells,
+            lambda: str(table_from_columns(data)),
+        )
+
+
+if __name__ == "__main__":
+    main()
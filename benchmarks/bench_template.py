@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering a list of items built from the same tags.
+
+Compares building the tags for each record and rendering them with filling a Template
+with the records.
+
+Usage: python benchmarks/bench_template.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from htmltools import Tag, TagList, Template, slot, tags
+
+
+def card(title: str, body: str, url: str) -> Tag:
+    return tags.div(
+        tags.div(tags.h5(title, class_="card-title"), class_="card-header"),
+        tags.div(tags.p(body, class_="card-text"), class_="card-body"),
+        tags.a("More", href=url, class_="btn btn-primary"),
+        class_="card",
+    )
+
+
+def main() -> None:
+    template = Template(card(slot("title"), slot("body"), slot("url")))
+    for n in (100, 1_000, 10_000):
+        records = [
+            (f"Card {i}", f"Text for <card> {i}", f"/card/{i}") for i in range(n)
+        ]
+
+        def build() -> str:
+            return str(TagList(*[card(*r) for r in records]))
+
+        def fill() -> str:
+            return str(
+                template.fill_many(
+                    {"title": t, "body": b, "url": u} for t, b, u in records
+                )
+            )
+
+        for label, fn in (("tags", build), ("template", fill)):
+            secs = min(timeit.repeat(fn, number=1, repeat=5))
+            print(f"{label:<10} {n:>6} records {secs * 1e3:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark tree traversal: tagify(), get_dependencies() and get_html_string().
+
+Compares the explicit-stack walkers used by htmltools with straightforward recursive
+implementations (equivalent to what htmltools used before), on deep and wide trees.
+
+Usage: python benchmarks/bench_traversal.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from copy import copy
+from typing import Callable
+
+from htmltools import HTMLDependency, MetadataNode, Tag, Tagifiable, TagList, tags
+
+# Recursive reference implementations -------------------------------------------------
+
+
+def recursive_tagify(x: TagList) -> TagList:
+    cp = copy(x)
+    for i in reversed(range(len(cp))):
+        child = cp[i]
+        if isinstance(child, Tag):
+            child_cp = copy(child)
+            child_cp.children = recursive_tagify(child_cp.children)
+            cp[i] = child_cp
+        elif isinstance(child, Tagifiable):
+            cp[i] = child.tagify()  # pyright: ignore[reportArgumentType]
+        elif isinstance(child, MetadataNode):
+            cp[i] = copy(child)
+    return cp
+
+
+def recursive_dependencies(x: TagList) -> list[HTMLDependency]:
+    deps: list[HTMLDependency] = []
+    for child in x:
+        if isinstance(child, HTMLDependency):
+            deps.append(child)
+        elif isinstance(child, Tag):
+            deps.extend(recursive_dependencies(child.children))
+    return deps
+
+
+# Trees ---------------------------------------------------------------------------------
+
+DEP = HTMLDependency("dep", "1.0")
+
+
+def make_deep(depth: int) -> TagList:
+    x = tags.div("leaf", DEP)
+    for _ in range(depth):
+        x = tags.div(x, tags.span("sibling"))
+    return TagList(x)
+
+
+def make_wide(width: int) -> TagList:
+    return TagList(
+        tags.ul(
+            *[tags.li(tags.a(f"item {i}", href=f"#{i}"), DEP) for i in range(width)]
+        )
+    )
+
+
+def run(label: str, fn: Callable[[], object], number: int = 5) -> None:
+    try:
+        secs = min(timeit.repeat(fn, number=1, repeat=number))
+        print(f"  {label:<32} {secs * 1e3:>10.2f} ms")
+    except RecursionError:
+        print(f"  {label:<32} {'RecursionError':>13}")
+
+
+def main() -> None:
+    limit = sys.getrecursionlimit()
+    trees = {
+        "deep (depth 200)": make_deep(200),
+        f"deep (depth {limit * 2})": make_deep(limit * 2),
+        "wide (10000 items)": make_wide(10_000),
+    }
+
+    for name, x in trees.items():
+        print(name)
+        tagified = x.tagify()
+        run("tagify (recursive)", lambda: recursive_tagify(x))
+        run("tagify (explicit stack)", lambda: x.tagify())
+        run("get_dependencies (recursive)", lambda: recursive_dependencies(tagified))
+        run(
+            "get_dependencies (explicit stack)",
+            lambda: tagified.get_dependencies(dedup=False),
+        )
+        run("get_html_string (explicit stack)", lambda: tagified.get_html_string())
+
+
+if __name__ == "__main__":
+    main()
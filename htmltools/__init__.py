@@ -8,7 +8,9 @@ from ._core import (
     HTMLDependency,
     HTMLDocument,
     HTMLTextDocument,
+    Lazy,
     MetadataNode,
+    RenderCache,
     RenderedHTML,
     ReprHtml,
     Tag,
@@ -23,9 +25,13 @@ from ._core import (
     head_content,
     is_tag_child,
     is_tag_node,
+    set_render_cache,
+    table_from_columns,
     wrap_displayhook_handler,
 )
-from ._util import css, html_escape
+from ._escape import EscapeCache, set_escape_cache
+from ._template import Template, slot
+from ._util import Style, css, html_escape, html_escape_many
 from .tags import (
     a,
     br,
@@ -49,12 +55,17 @@ from .tags import (
 __all__ = (
     "svg",
     "tags",
+    "EscapeCache",
     "HTML",
     "HTMLDependency",
     "HTMLDocument",
     "HTMLTextDocument",
+    "Lazy",
     "MetadataNode",
+    "RenderCache",
     "RenderedHTML",
+    "Style",
+    "Template",
     "Tag",
     "TagAttrs",
     "TagAttrValue",
@@ -68,9 +79,14 @@ __all__ = (
     "head_content",
     "is_tag_child",
     "is_tag_node",
+    "set_escape_cache",
+    "set_render_cache",
+    "slot",
+    "table_from_columns",
     "wrap_displayhook_handler",
     "css",
     "html_escape",
+    "html_escape_many",
     "a",
     "br",
     "code",
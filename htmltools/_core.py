@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
+import inspect
+import io
 import json
 import os
 import posixpath
@@ -9,16 +13,21 @@ import re
 import shutil
 import sys
 import tempfile
+import threading
 import urllib.parse
 import webbrowser
-from collections import UserList, UserString
+from collections import OrderedDict, UserList, UserString
 from copy import copy, deepcopy
+from itertools import chain
 from pathlib import Path
 from typing import (
     Any,
+    AsyncGenerator,
     Callable,
     Dict,
+    Generator,
     Iterable,
+    Iterator,
     Mapping,
     Optional,
     Sequence,
@@ -32,9 +41,9 @@ from typing import (
 # they should both come from the same typing module.
 # https://peps.python.org/pep-0655/#usage-in-python-3-11
 if sys.version_info >= (3, 11):
-    from typing import Never, NotRequired, TypedDict
+    from typing import Never, NotRequired, Self, TypedDict
 else:
-    from typing_extensions import Never, NotRequired, TypedDict
+    from typing_extensions import Never, NotRequired, Self, TypedDict
 
 if sys.version_info >= (3, 13):
     from typing import TypeIs
@@ -45,11 +54,19 @@ from typing import Literal, Protocol, SupportsIndex, runtime_checkable
 
 from packaging.version import Version
 
+from ._escape import (
+    cached_escape_attr,
+    cached_escape_text,
+    escape_script,
+    escape_style,
+)
 from ._util import (
+    Style,
     ensure_http_server,
-    flatten,
     hash_deterministic,
     html_escape,
+    html_escape_many,
+    normalize_attr_name,
     package_dir,
 )
 
@@ -61,6 +78,7 @@ __all__ = (
     "HTML",
     "MetadataNode",
     "HTMLDependency",
+    "Lazy",
     "RenderedHTML",
     "TagAttrs",
     "TagAttrValue",
@@ -70,6 +88,7 @@ __all__ = (
     "Tagifiable",
     "consolidate_attrs",
     "head_content",
+    "table_from_columns",
     "is_tag_child",
     "is_tag_node",
     "wrap_displayhook_handler",
@@ -132,11 +151,13 @@ TagChild = Union[
     float,
     None,
     Sequence["TagChild"],
+    Iterator["TagChild"],
 ]
 """
 Types of objects that can be passed as children to Tag functions like `div()`. The `Tag`
 functions and the `TagList()` constructor can accept these as unnamed arguments; they
-will be flattened and normalized to `TagNode` objects.
+will be flattened and normalized to `TagNode` objects. Iterators (like generators) are
+wrapped in :class:`Lazy`, so that they aren't consumed until the HTML is written.
 """
 
 
@@ -177,7 +198,7 @@ def is_tag_node(x: object) -> TypeIs[TagNode]:
         `True` if the object is a `TagNode`, `False` otherwise.
     """
     # Note: Tag and TagList are both Tagifiable
-    return isinstance(x, (Tagifiable, MetadataNode, ReprHtml, str, HTML))
+    return _node_kind(x) != 0
 
 
 def is_tag_child(x: object) -> TypeIs[TagChild]:
@@ -210,6 +231,7 @@ def is_tag_child(x: object) -> TypeIs[TagChild]:
             float,
             # None, # Handled above
             Sequence,
+            Iterator,
         ),
     ):
         return True
@@ -225,7 +247,7 @@ class Tagifiable(Protocol):
     returns a `TagList`, the children of the `TagList` must also be tagified.
     """
 
-    def tagify(self) -> "TagList | Tag | MetadataNode | str | HTML": ...
+    def tagify(self) -> "TagList | Tag | MetadataNode | Lazy | str | HTML": ...
 
 
 @runtime_checkable
@@ -251,6 +273,60 @@ class ReprHtml(Protocol):
     def _repr_html_(self) -> str: ...
 
 
+# The kinds of TagNode an object can be, as bit flags. See _node_kind().
+_KIND_TAGIFIABLE = 1
+_KIND_REPR_HTML = 2
+_KIND_METADATA = 4
+_KIND_TEXT = 8
+
+_node_kinds: dict[type, int] = {}
+
+
+def _node_kind(x: object) -> int:
+    # Return the kinds of TagNode that `x` is (0 if it isn't one), as _KIND_* flags.
+    #
+    # isinstance() checks against runtime_checkable Protocols like Tagifiable and
+    # ReprHtml look for each of the protocol's members on the object, which is many
+    # times slower than checking against a class (see benchmarks/bench_dispatch.py).
+    # Since these checks are made for every child when constructing, tagifying, and
+    # rendering, the result is cached for each type. This assumes that the protocols'
+    # methods are defined on the class, not set on instances.
+    kind = _node_kinds.get(type(x))
+    if kind is None:
+        kind = 0
+        if isinstance(x, Tagifiable):
+            kind |= _KIND_TAGIFIABLE
+        if isinstance(x, ReprHtml):
+            kind |= _KIND_REPR_HTML
+        if isinstance(x, MetadataNode):
+            kind |= _KIND_METADATA
+        if isinstance(x, (str, HTML)):
+            kind |= _KIND_TEXT
+        if len(_node_kinds) >= 1000:
+            # Don't hold on to classes created on the fly forever.
+            _node_kinds.clear()
+        _node_kinds[type(x)] = kind
+    return kind
+
+
+# Incremented whenever a TagList that has been checked by TagList._needs_tagify() is
+# modified. The results cached by _needs_tagify() are only valid for the generation they
+# were computed in.
+_tagify_generation = 0
+
+# Default size (in characters) of the chunks yielded by the streaming renderers.
+_DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+# Writable text and binary streams, for the write_html() methods.
+class _TextWriter(Protocol):
+    def write(self, s: str, /) -> object: ...
+
+
+class _BinaryWriter(Protocol):
+    def write(self, b: bytes, /) -> object: ...
+
+
 # =============================================================================
 # TagList class
 # =============================================================================
@@ -271,6 +347,11 @@ class TagList(UserList[TagNode]):
     <div id="foo" class="bar"></div>
     """
 
+    # Whether the tree under this TagList has anything for tagify() to change, and the
+    # value of _tagify_generation when that was last checked. See _needs_tagify().
+    _tagify_gen: int = -1
+    _tagify_needed: bool = True
+
     def _should_not_expand(self, x: object) -> TypeIs[str]:
         """
         Check if an object should not be expanded into a list of children.
@@ -278,12 +359,22 @@ class TagList(UserList[TagNode]):
         return isinstance(x, str)
 
     def __init__(self, *args: TagChild) -> None:
-        super().__init__(_tagchilds_to_tagnodes(args))
+        # The list is new, so there's no need for UserList.__init__() to copy it.
+        self.data = _tagchilds_to_tagnodes(args)
+
+    def __copy__(self) -> Self:
+        cp = self.__class__.__new__(self.__class__)
+        cp.__dict__.update(self.__dict__)
+        cp.data = self.data[:]
+        # The copy is a new list, so no other cached results depend on it.
+        cp._tagify_gen = -1
+        return cp
 
     def extend(self, other: Iterable[TagChild]) -> None:
         """
         Extend the children by appending an iterable of children.
         """
+        self._tagify_changed()
         super().extend(_tagchilds_to_tagnodes(other))
 
     def append(self, item: TagChild, *args: TagChild) -> None:
@@ -300,6 +391,74 @@ class TagList(UserList[TagNode]):
 
         self[i:i] = _tagchilds_to_tagnodes([item])
 
+    @overload
+    def __setitem__(self, i: SupportsIndex, item: TagNode) -> None: ...
+
+    @overload
+    def __setitem__(self, i: slice, item: Iterable[TagNode]) -> None: ...
+
+    def __setitem__(self, i: SupportsIndex | slice, item: Any) -> None:
+        self._tagify_changed()
+        super().__setitem__(i, item)
+
+    def __iadd__(self, other: Iterable[TagNode]) -> Self:
+        self._tagify_changed()
+        return super().__iadd__(other)
+
+    def _tagify_changed(self) -> None:
+        # Called before this TagList is modified.
+        global _tagify_generation
+        if self._tagify_gen == _tagify_generation:
+            # This TagList was checked along with its ancestors, whose cached results
+            # may now be stale, and we don't know what the ancestors are. Invalidate
+            # every cached result.
+            _tagify_generation += 1
+
+    def _needs_tagify(self) -> bool:
+        # Return True if the tree under this TagList has any Tagifiable objects (other
+        # than plain Tags) or MetadataNodes, which tagify() would replace or copy. Tag
+        # subclasses that override get_dependencies() also count, so that a tree that
+        # doesn't need tagifying also has no dependencies.
+        #
+        # The result is cached on every TagList that gets checked. When a TagList that
+        # has been checked is modified, the results for all TagLists are invalidated,
+        # since its ancestors' results could be wrong too. (Building a new tree doesn't
+        # invalidate anything, since none of its TagLists have been checked yet.)
+        gen = _tagify_generation
+        if self._tagify_gen == gen:
+            return self._tagify_needed
+
+        stack: list[tuple[TagList, Iterator[TagNode]]] = [(self, iter(self))]
+        while stack:
+            tag_list, children = stack[-1]
+            for child in children:
+                if (
+                    isinstance(child, Tag)
+                    and type(child).tagify is Tag.tagify
+                    and type(child).get_dependencies is Tag.get_dependencies
+                ):
+                    grandchildren = child.children
+                    if grandchildren._tagify_gen != gen:
+                        stack.append((grandchildren, iter(grandchildren)))
+                        break
+                    if not grandchildren._tagify_needed:
+                        continue
+                elif not _node_kind(child) & (_KIND_TAGIFIABLE | _KIND_METADATA):
+                    continue
+
+                # Found something to tagify, so every TagList on the stack needs it.
+                for tag_list, _ in stack:
+                    tag_list._tagify_gen = gen
+                    tag_list._tagify_needed = True
+                return True
+
+            else:
+                tag_list._tagify_gen = gen
+                tag_list._tagify_needed = False
+                stack.pop()
+
+        return False
+
     def __add__(self, item: Iterable[TagChild]) -> TagList:
         """
         Return a new TagList with the item added at the end.
@@ -323,26 +482,35 @@ class TagList(UserList[TagNode]):
     def tagify(self) -> "TagList":
         """
         Convert any tagifiable children to Tag/TagList objects.
+
+        A new TagList is returned. Child tags are copied only if there is something to
+        tagify beneath them; otherwise they are shared with this TagList.
         """
 
         cp = copy(self)
+        _tagify_in_place(cp)
+        return cp
 
-        # Iterate backwards because if we hit a Tagifiable object, it may be replaced
-        # with 0, 1, or more items (if it returns TagList).
-        for i in reversed(range(len(cp))):
-            child = cp[i]
+    def freeze(self) -> "TagList":
+        """
+        Tagify this tag list and freeze the tags in it.
 
-            if isinstance(child, Tagifiable):
-                tagified_child = child.tagify()
-                if isinstance(tagified_child, TagList):
-                    # If the Tagifiable object returned a TagList, flatten it into this
-                    # one.
-                    cp[i : i + 1] = _tagchilds_to_tagnodes(tagified_child)
-                else:
-                    cp[i] = tagified_child
+        Each tag in the result is pre-rendered: its dependencies are collected when it
+        is frozen, and its HTML is written the first time it is rendered; both are
+        reused every time after that. This is useful for content that is the same
+        every time it is rendered, like a navbar or footer, but is rendered many times.
 
-            elif isinstance(child, MetadataNode):
-                cp[i] = copy(child)
+        The tags (and the tags they contain) must not be modified after they are
+        frozen.
+
+        Returns
+        -------
+        :
+            A new TagList where each tag has been frozen with :meth:`Tag.freeze`.
+        """
+
+        cp = self.tagify()
+        cp.data = [_FrozenTag(x) if isinstance(x, Tag) else x for x in cp]
         return cp
 
     def save_html(
@@ -370,13 +538,101 @@ class TagList(UserList[TagNode]):
             file, libdir=libdir, include_version=include_version
         )
 
-    def render(self) -> RenderedHTML:
+    def render(self, *, minify: bool = False) -> RenderedHTML:
         """
         Get string representation as well as its HTML dependencies.
+
+        Parameters
+        ----------
+        minify
+            If True, write compact HTML. See :meth:`get_html_string`.
         """
-        cp = self.tagify()
-        deps = cp.get_dependencies()
-        return {"dependencies": deps, "html": cp.get_html_string()}
+        if type(self) is not TagList:
+            # Subclasses may override tagify(), get_dependencies(), or
+            # get_html_string(); respect that.
+            cp = self.tagify()
+            deps = cp.get_dependencies()
+            if minify:
+                return {"dependencies": deps, "html": cp.get_html_string(minify=True)}
+            return {"dependencies": deps, "html": cp.get_html_string()}
+
+        return _render(self, minify)
+
+    def iter_html(self, *, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Iterate over the HTML for this tag list in chunks.
+
+        The HTML is generated while the tree is walked, so the complete string is never
+        held in memory. Joining the chunks gives the same result as
+        ``render()["html"]``.
+
+        Parameters
+        ----------
+        chunk_size
+            The approximate number of characters in each chunk. Chunks are split
+            between nodes, so a chunk may be larger than this if it contains a large
+            text node.
+
+        Returns
+        -------
+        :
+            An iterator over strings of HTML.
+        """
+        return _iter_html_chunks(self.tagify(), chunk_size)
+
+    def aiter_html(
+        self, *, chunk_size: int = _DEFAULT_CHUNK_SIZE
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronously iterate over the HTML for this tag list in chunks.
+
+        This is the same as :meth:`iter_html`, except that control is given back to
+        the event loop after each chunk, so that rendering a large page doesn't block
+        other tasks. A chunk is only generated when the consumer asks for it, and
+        rendering stops if the consumer is cancelled or closes the iterator.
+
+        Parameters
+        ----------
+        chunk_size
+            The approximate number of characters in each chunk.
+
+        Returns
+        -------
+        :
+            An asynchronous iterator over strings of HTML.
+        """
+        if type(self) is not TagList:
+            # Subclasses may override tagify(); respect that.
+            return _aiter_html_chunks(_iter_html_chunks(self.tagify(), chunk_size))
+        # The tree is tagified as it's walked, between chunks, instead of all at once.
+        return _aiter_html_chunks(_iter_html_chunks(self, chunk_size, tagify=True))
+
+    def write_html(
+        self,
+        fp: _TextWriter | _BinaryWriter,
+        *,
+        encoding: str = "utf-8",
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Write the HTML for this tag list to a file-like object.
+
+        The HTML is written in chunks as it is generated, so the complete string is
+        never held in memory.
+
+        Parameters
+        ----------
+        fp
+            A writable file-like object. It can be a text stream (like an open text
+            file or :class:`io.StringIO`) or a binary stream (like a file opened in
+            ``"wb"`` mode, :class:`io.BytesIO`, or :class:`gzip.GzipFile`).
+        encoding
+            The encoding to use when ``fp`` is a binary stream. Each chunk is encoded
+            as it is written. (Text streams do their own encoding.)
+        chunk_size
+            The approximate number of characters to write at a time.
+        """
+        _write_chunks(fp, _iter_html_chunks(self.tagify(), chunk_size), encoding)
 
     def get_html_string(
         self,
@@ -384,6 +640,7 @@ class TagList(UserList[TagNode]):
         eol: str = "\n",
         *,
         add_ws: bool = True,
+        minify: bool = False,
         _escape_strings: bool = True,
     ) -> str:
         """
@@ -400,65 +657,25 @@ class TagList(UserList[TagNode]):
             either this is True, or the child's add_ws attribute is True, then
             whitespace will be added; if they are both False, then no whitespace will be
             added.
-        """
-
-        html_ = ""
-        first_child = True
-        prev_was_add_ws = add_ws
-
-        for child in self:
-            if isinstance(child, MetadataNode):
-                continue
-
-            # True if the previous and current node are inline; False otherwise. This
-            # affects whether or not we add whitespace and indentation.
-            prev_or_current_add_ws = prev_was_add_ws or (
-                (isinstance(child, Tag) and child.add_ws)
-            )
-
-            if first_child:
-                first_child = False
-            elif prev_or_current_add_ws:
-                html_ += eol
-
-            if isinstance(child, Tag):
-                # Note that we don't pass _escape_strings along, because that should
-                # only be set to True when <script> and <style> tags call
-                # self.children.get_html_string(), and those tags don't have children to
-                # recurse into.
-                if prev_or_current_add_ws:
-                    html_ += child.get_html_string(indent, eol)
-                else:
-                    html_ += child.get_html_string(0, "")
-
-                prev_was_add_ws = child.add_ws
-
-            elif isinstance(child, ReprHtml):
-                if prev_was_add_ws:
-                    html_ += "  " * indent
-
-                html_ += child._repr_html_()  # pyright: ignore[reportPrivateUsage]
-
-                prev_was_add_ws = False
-
-            elif isinstance(child, Tagifiable):
-                raise RuntimeError(
-                    "Encountered a non-tagified object. x.tagify() must be called before x.render()"
-                )
-
-            else:
-                # If we get here, x must be a string.
-                if prev_was_add_ws:
-                    html_ += "  " * indent
-
-                if _escape_strings:
-                    html_ += _normalize_text(child)
-                else:
-                    html_ += child
-
-                prev_was_add_ws = False
-
-        return html_
+        minify
+            If True, write compact HTML: no indentation or line breaks are added,
+            whitespace-only text is collapsed to a single space (except inside
+            ``<pre>``, ``<textarea>``, ``<script>``, and ``<style>``), empty attribute
+            values are written in their short form (``disabled`` instead of
+            ``disabled=""``), and attribute values are only quoted when needed.
+        """
+
+        html_: list[str] = []
+        _write_html(
+            self,
+            html_,
+            indent,
+            eol,
+            add_ws=add_ws,
+            escape=_escape_strings,
+            minify=minify,
+        )
+        return "".join(html_)
 
     def get_dependencies(self, *, dedup: bool = True) -> list["HTMLDependency"]:
         """
@@ -471,13 +688,7 @@ class TagList(UserList[TagNode]):
         """
 
         deps: list[HTMLDependency] = []
-        for x in self:
-            if isinstance(x, HTMLDependency):
-                deps.append(x)
-            elif isinstance(x, Tag):
-                # When we recurse, don't deduplicate at every node. We only need to do
-                # that once, at the top level.
-                deps.extend(x.get_dependencies(dedup=False))
+        _collect_dependencies(self, deps)
 
         if dedup:
             return _resolve_dependencies(deps)
@@ -496,7 +707,8 @@ class TagList(UserList[TagNode]):
         _tag_show(self, renderer)
 
     def __eq__(self, other: Any) -> bool:
-        return _equals_impl(self, other)
+        # The cached results of _needs_tagify() aren't part of the value.
+        return _equals_impl(self, other, ignore=("_tagify_gen", "_tagify_needed"))
 
     def __str__(self) -> str:
         return _render_tag_or_taglist(self)
@@ -511,6 +723,10 @@ class TagList(UserList[TagNode]):
 # =============================================================================
 # TagAttrDict class
 # =============================================================================
+# dict.__setitem__(), with the types of a TagAttrDict's items.
+_dict_setitem = dict[str, "str | HTML"].__setitem__
+
+
 class TagAttrDict(Dict[str, "str | HTML"]):
     """
     A dictionary-like object that can be used to store attributes for a tag. All
@@ -526,17 +742,71 @@ class TagAttrDict(Dict[str, "str | HTML"]):
         More attributes.
     """
 
+    # The attributes as written in an opening tag, and as written when minifying. These
+    # are cached until the dict is modified, so re-rendering a long-lived tree only
+    # writes the attributes of tags which have changed.
+    __slots__ = ("_html", "_html_minified", "_classes")
+
     def __init__(
         self, *args: Mapping[str, TagAttrValue], **kwargs: TagAttrValue
     ) -> None:
-        super().__init__()
-        self.update(*args, **kwargs)
+        self._html: str | None = None
+        self._html_minified: str | None = None
+        # The class attribute as an ordered set of class names, for Tag.add_class() and
+        # friends. See _class_list().
+        self._classes: _ClassList | None = None
+        # The dict starts out empty, so the attributes can be merged straight into it.
+        if kwargs:
+            args = args + (kwargs,)
+        if args:
+            self._merge_attrs(self, args)
+
+    def __copy__(self) -> Self:
+        # Unlike copy.copy(), this doesn't normalize each attribute again, and keeps the
+        # cached HTML (which is still correct for the copy).
+        cls = self.__class__
+        cp = cls.__new__(cls)
+        super(TagAttrDict, cp).update(self)
+        cp._html = self._html
+        cp._html_minified = self._html_minified
+        # This is changed in place, so it isn't shared.
+        cp._classes = None
+        d = getattr(self, "__dict__", None)
+        if d:
+            cp.__dict__.update(d)
+        return cp
 
     def __setitem__(self, name: str, value: TagAttrValue) -> None:
         val = self._normalize_attr_value(value)
         if val is not None:
             nm = self._normalize_attr_name(name)
             super().__setitem__(nm, val)
+            self._changed()
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._changed()
+
+    def __ior__(self, other: Any) -> Self:  # pyright: ignore
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def pop(self, key: str, *args: Any) -> Any:  # pyright: ignore
+        self._changed()
+        return super().pop(key, *args)
+
+    def popitem(self) -> tuple[str, str | HTML]:
+        self._changed()
+        return super().popitem()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:  # pyright: ignore
+        self._changed()
+        return super().setdefault(key, default)
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
 
     def update(  # type: ignore[reportIncompatibleMethodOverride] # TODO-future: fix typing
         self,
@@ -547,26 +817,73 @@ class TagAttrDict(Dict[str, "str | HTML"]):
             args = args + (kwargs,)
 
         attrz: dict[str, str | HTML] = {}
+        self._merge_attrs(attrz, args)
+        super().update(attrz)
+        self._changed()
+
+    def _changed(self) -> None:
+        self._html = None
+        self._html_minified = None
+
+    def _class_list(self) -> _ClassList | None:
+        # The class attribute as an ordered set of class names, which is kept up to
+        # date by Tag.add_class() and .remove_class(), so that they don't need to split
+        # the attribute again. If the attribute has been changed some other way, the
+        # set is made again. Returns None if the attribute is HTML.
+        val = super().get("class")
+        classes = self._classes
+        if classes is None or classes.value is not val:
+            if val is not None and not isinstance(val, str):
+                return None
+            classes = self._classes = _ClassList(val)
+        return classes
+
+    def _set_class_list(self, x: _ClassList) -> None:
+        # Store the value of the class list (which has just been changed).
+        if x.value:
+            super().__setitem__("class", x.value)
+        else:
+            super().pop("class", None)
+        self._changed()
+
+    def _get_html(self, minify: bool = False) -> str:
+        # The attributes as they're written in an opening tag (each with a leading
+        # space).
+        if minify:
+            if self._html_minified is None:
+                self._html_minified = _attrs_html(self, True)
+            return self._html_minified
+        if self._html is None:
+            self._html = _attrs_html(self, False)
+        return self._html
+
+    @classmethod
+    def _merge_attrs(
+        cls, into: dict[str, str | HTML], args: tuple[Mapping[str, TagAttrValue], ...]
+    ) -> None:
+        # Normalize the attributes in `args` and add them to `into`, joining the values
+        # of attributes with the same (normalized) name with a space. Values are set
+        # with dict.__setitem__() (see _dict_setitem) so that they aren't normalized a
+        # second time when `into` is a TagAttrDict.
+        setitem = _dict_setitem
+        normalize_name = cls._normalize_attr_name
+        normalize_value = cls._normalize_attr_value
         for arg in args:
             for k, v in arg.items():
-                val = self._normalize_attr_value(v)
-                if val is None:
-                    continue
-                nm = self._normalize_attr_name(k)
+                # Plain string values (by far the most common) don't need converting.
+                if type(v) is not str:
+                    v = normalize_value(v)
+                    if v is None:
+                        continue
+                nm = normalize_name(k)
 
-                if nm in attrz:
-                    val = attrz[nm] + " " + val
+                if nm in into:
+                    v = into[nm] + " " + v
 
-                attrz[nm] = val
+                setitem(into, nm, v)
 
-        super().update(attrz)
-
-    @staticmethod
-    def _normalize_attr_name(x: str) -> str:
-        # e.g., foo_Bar_ -> foo-Bar
-        if x.endswith("_"):
-            x = x[:-1]
-        return x.replace("_", "-")
+    # e.g., foo_Bar_ -> foo-Bar
+    _normalize_attr_name = staticmethod(normalize_attr_name)
 
     @staticmethod
     def _normalize_attr_value(x: TagAttrValue) -> str | HTML | None:
@@ -586,6 +903,15 @@ class TagAttrDict(Dict[str, "str | HTML"]):
         )
 
 
+class _ClassList(Dict[str, None]):
+    # The class names in a class attribute, as an ordered set, and the attribute value.
+    __slots__ = ("value",)
+
+    def __init__(self, value: str | None) -> None:
+        super().__init__(dict.fromkeys(value.split()) if value else ())
+        self.value = value
+
+
 # =============================================================================
 # Tag class
 # =============================================================================
@@ -652,7 +978,17 @@ class Tag:
     name: str
     add_ws: bool
     attrs: TagAttrDict
-    children: TagList
+
+    # Slots keep Tag objects small, since trees can have very many of them. Subclasses
+    # without __slots__ of their own can still have other fields.
+    __slots__ = (
+        "name",
+        "add_ws",
+        "attrs",
+        "_children",
+        "prev_displayhook",
+        "__weakref__",
+    )
 
     def __init__(
         self,
@@ -672,11 +1008,17 @@ class Tag:
 
         self.add_ws = _add_ws
 
+        # Attributes are usually given as keyword arguments, in which case all of the
+        # positional arguments are children and there's no need to split them up.
         attrs = [x for x in args if isinstance(x, dict)]
-        self.attrs = TagAttrDict(*attrs, **kwargs)
-
-        kids = [x for x in args if not isinstance(x, dict)]
-        self.children = TagList(*kids)
+        if attrs:
+            self.attrs = TagAttrDict(*attrs, **kwargs)
+            kids = [x for x in args if not isinstance(x, dict)]
+            self._children = TagList(*kids)
+        else:
+            self.attrs = TagAttrDict(**kwargs)
+            # There are no attribute dicts in `args` here.
+            self._children = TagList(*args)  # pyright: ignore[reportArgumentType]
 
         self.prev_displayhook: Callable[[object], None] | None = None
 
@@ -685,10 +1027,29 @@ class Tag:
         cp = cls.__new__(cls)
         # Any instance fields (like .children, and _attrs for the tag subclass) are
         # shallow-copied.
-        new_dict = {key: copy(value) for key, value in self.__dict__.items()}
-        cp.__dict__.update(new_dict)
+        cp.name = self.name
+        cp.add_ws = self.add_ws
+        cp.attrs = copy(self.attrs)
+        cp._children = copy(self._children)
+        cp.prev_displayhook = self.prev_displayhook
+        d = getattr(self, "__dict__", None)
+        if d:
+            cp.__dict__.update({key: copy(value) for key, value in d.items()})
         return cp
 
+    @property
+    def children(self) -> TagList:
+        return self._children
+
+    @children.setter
+    def children(self, value: TagList) -> None:
+        # The cached results of TagList._needs_tagify() for this tag's ancestors
+        # depend on the old children.
+        old = getattr(self, "_children", None)
+        if isinstance(old, TagList):
+            old._tagify_changed()  # pyright: ignore[reportPrivateUsage]
+        self._children = value
+
     def __enter__(self) -> None:
         if self.prev_displayhook is not None:
             raise RuntimeError(
@@ -744,10 +1105,38 @@ class Tag:
         :
             The modified tag.
         """
-        if prepend:
-            self.attrs.update({"class": class_}, {"class": self.attrs.get("class")})
+        classes = self.attrs._class_list()  # pyright: ignore[reportPrivateUsage]
+        if (
+            classes is None
+            or not isinstance(  # pyright: ignore[reportUnnecessaryIsInstance]
+                class_, str
+            )
+            or not class_
+            or class_.isspace()
+        ):
+            # HTML, and strings with no class names in them, are joined with the other
+            # classes as-is.
+            if prepend:
+                self.attrs.update({"class": class_}, {"class": self.attrs.get("class")})
+            else:
+                self.attrs.update({"class": self.attrs.get("class")}, {"class": class_})
+            return self
+
+        # Class names which are already there aren't added again.
+        new = [nm for nm in dict.fromkeys(class_.split()) if nm not in classes]
+        if not new:
+            return self
+        added = " ".join(new)
+        if not classes.value:
+            classes.value = added
+            classes.update(dict.fromkeys(new))
+        elif prepend:
+            classes = _ClassList(added + " " + classes.value)
+            self.attrs._classes = classes  # pyright: ignore[reportPrivateUsage]
         else:
-            self.attrs.update({"class": self.attrs.get("class")}, {"class": class_})
+            classes.value = classes.value + " " + added
+            classes.update(dict.fromkeys(new))
+        self.attrs._set_class_list(classes)  # pyright: ignore
         return self
 
     def remove_class(self: TagT, class_: str) -> TagT:
@@ -767,6 +1156,16 @@ class Tag:
         # Nothing to do if no class is specified
         if not class_:
             return self
+
+        classes = self.attrs._class_list()  # pyright: ignore[reportPrivateUsage]
+        if classes is not None:
+            class_ = str(class_).strip()
+            if class_ in classes:
+                del classes[class_]
+                classes.value = " ".join(classes)
+                self.attrs._set_class_list(classes)  # pyright: ignore
+            return self
+
         cls = self.attrs.get("class") or ""
 
         # If no class attribute exists, there's nothing to remove
@@ -801,195 +1200,1523 @@ class Tag:
         :
             ``True`` if the tag has the class, ``False`` otherwise.
         """
+        classes = self.attrs._class_list()  # pyright: ignore[reportPrivateUsage]
+        if classes is not None:
+            return class_ in classes
         cls = self.attrs.get("class")
         if cls:
             return class_ in cls.split()
         else:
             return False
 
-    def add_style(self: TagT, style: str | HTML, *, prepend: bool = False) -> TagT:
-        """
-        Add a style value(s) to the HTML style attribute.
+    def add_style(
+        self: TagT, style: str | HTML | Style, *, prepend: bool = False
+    ) -> TagT:
+        """
+        Add a style value(s) to the HTML style attribute.
+
+        Parameters
+        ----------
+        style
+            CSS properties and values already properly formatted. Each should already
+            contain trailing semicolons. Can also be a :class:`~htmltools.Style`.
+        prepend
+            Bool that determines if the `style` is added to the beginning or end of the
+            style attribute.
+
+        See Also
+        --------
+        ~htmltools.css
+        ~htmltools.Style
+
+        Returns
+        -------
+        :
+            The modified tag.
+        """
+
+        if isinstance(style, (str, HTML)) and not style.endswith(";"):
+            raise ValueError("`Tag.add_style(style=)` must end with a semicolon")
+
+        value: str | HTML | None
+        if isinstance(style, Style):
+            value = str(style) or None
+        else:
+            value = style
+        if prepend:
+            self.attrs.update({"style": value}, {"style": self.attrs.get("style")})
+        else:
+            self.attrs.update({"style": self.attrs.get("style")}, {"style": value})
+        return self
+
+    def tagify(self: TagT) -> TagT:
+        """
+        Convert any tagifiable children to Tag/TagList objects.
+
+        A new Tag is returned. Child tags are copied only if there is something to
+        tagify beneath them; otherwise they are shared with this Tag.
+        """
+
+        cp = copy(self)
+        # copy() has already made a shallow copy of the children.
+        _tagify_in_place(cp.children)
+        return cp
+
+    def freeze(self) -> "Tag":
+        """
+        Tagify this tag and freeze it.
+
+        A frozen tag is pre-rendered: its dependencies are collected when it is frozen,
+        and its HTML is written the first time it is rendered; both are reused every
+        time after that, including when it is a child of other tags. This is useful for
+        content that is the same every time it is rendered, like a navbar or footer,
+        but is rendered many times.
+
+        The tag (and the tags it contains) must not be modified after it is frozen.
+
+        Returns
+        -------
+        :
+            A frozen copy of the tag.
+
+        Examples
+        --------
+        >>> from htmltools import div, a
+        >>> navbar = div(a("Home", href="/"), class_="navbar").freeze()
+        >>> div(navbar, "Page content")
+        <div>
+          <div class="navbar">
+            <a href="/">Home</a>
+          </div>
+          Page content
+        </div>
+        """
+
+        return _FrozenTag(self.tagify())
+
+    def get_html_string(
+        self, indent: int = 0, eol: str = "\n", *, minify: bool = False
+    ) -> str:
+        """
+        Get the HTML string representation of the tag.
+
+        Parameters
+        ----------
+        indent
+            The number of spaces to indent the tag.
+        eol
+            The end-of-line character(s).
+        minify
+            If True, write compact HTML: no indentation or line breaks are added,
+            whitespace-only text is collapsed to a single space (except inside
+            ``<pre>``, ``<textarea>``, ``<script>``, and ``<style>``), empty attribute
+            values are written in their short form (``disabled`` instead of
+            ``disabled=""``), and attribute values are only quoted when needed.
+        """
+
+        html_: list[str] = []
+        _write_html(self, html_, indent, eol, minify=minify)
+        return "".join(html_)
+
+    def render(self, *, minify: bool = False) -> RenderedHTML:
+        """
+        Get string representation as well as its HTML dependencies.
+
+        Parameters
+        ----------
+        minify
+            If True, write compact HTML. See :meth:`get_html_string`.
+        """
+        if type(self).tagify is not Tag.tagify:
+            cp = self.tagify()
+            deps = cp.get_dependencies()
+            if minify:
+                return {"dependencies": deps, "html": cp.get_html_string(minify=True)}
+            return {"dependencies": deps, "html": cp.get_html_string()}
+
+        return _render(self, minify)
+
+    def iter_html(self, *, chunk_size: int = _DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Iterate over the HTML for this tag in chunks.
+
+        The HTML is generated while the tree is walked, so the complete string is never
+        held in memory. Joining the chunks gives the same result as
+        ``render()["html"]``.
+
+        Parameters
+        ----------
+        chunk_size
+            The approximate number of characters in each chunk. Chunks are split
+            between nodes, so a chunk may be larger than this if it contains a large
+            text node.
+
+        Returns
+        -------
+        :
+            An iterator over strings of HTML.
+        """
+        return _iter_html_chunks(self.tagify(), chunk_size)
+
+    def aiter_html(
+        self, *, chunk_size: int = _DEFAULT_CHUNK_SIZE
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronously iterate over the HTML for this tag in chunks.
+
+        This is the same as :meth:`iter_html`, except that control is given back to
+        the event loop after each chunk, so that rendering a large page doesn't block
+        other tasks. A chunk is only generated when the consumer asks for it, and
+        rendering stops if the consumer is cancelled or closes the iterator.
+
+        Parameters
+        ----------
+        chunk_size
+            The approximate number of characters in each chunk.
+
+        Returns
+        -------
+        :
+            An asynchronous iterator over strings of HTML.
+        """
+        if type(self).tagify is not Tag.tagify:
+            return _aiter_html_chunks(_iter_html_chunks(self.tagify(), chunk_size))
+        # The tree is tagified as it's walked, between chunks, instead of all at once.
+        return _aiter_html_chunks(_iter_html_chunks(self, chunk_size, tagify=True))
+
+    def write_html(
+        self,
+        fp: _TextWriter | _BinaryWriter,
+        *,
+        encoding: str = "utf-8",
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Write the HTML for this tag to a file-like object.
+
+        The HTML is written in chunks as it is generated, so the complete string is
+        never held in memory.
+
+        Parameters
+        ----------
+        fp
+            A writable file-like object. It can be a text stream (like an open text
+            file or :class:`io.StringIO`) or a binary stream (like a file opened in
+            ``"wb"`` mode, :class:`io.BytesIO`, or :class:`gzip.GzipFile`).
+        encoding
+            The encoding to use when ``fp`` is a binary stream. Each chunk is encoded
+            as it is written. (Text streams do their own encoding.)
+        chunk_size
+            The approximate number of characters to write at a time.
+        """
+        _write_chunks(fp, _iter_html_chunks(self.tagify(), chunk_size), encoding)
+
+    def save_html(
+        self, file: str, *, libdir: Optional[str] = "lib", include_version: bool = True
+    ) -> str:
+        """
+        Save to a HTML file.
+
+        Parameters
+        ----------
+        file
+            The file to save to.
+        libdir
+            The directory to save the dependencies to.
+        include_version
+            Whether to include the version number in the dependency folder name.
+
+        Returns
+        -------
+        The path to the generated HTML file.
+        """
+
+        return HTMLDocument(self).save_html(
+            file, libdir=libdir, include_version=include_version
+        )
+
+    def get_dependencies(self, dedup: bool = True) -> list["HTMLDependency"]:
+        """
+        Get any HTML dependencies.
+        """
+        return self.children.get_dependencies(dedup=dedup)
+
+    def show(self, renderer: Literal["auto", "ipython", "browser"] = "auto") -> object:
+        """
+        Preview as a complete HTML document.
+
+        Parameters
+        ----------
+        renderer
+            The renderer to use.
+        """
+        _tag_show(self, renderer)
+
+    def __eq__(self, other: Any) -> bool:
+        return _equals_impl(self, other)
+
+    def __str__(self) -> str:
+        return _render_tag_or_taglist(self)
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def _repr_html_(self) -> str:
+        return str(self)
+
+
+class _FrozenTag(Tag):
+    """
+    A tagified Tag whose HTML and dependencies are cached. See Tag.freeze().
+    """
+
+    def __init__(self, tag: Tag) -> None:
+        # A frozen tag looks like the tag it was made from, but it's rendered by
+        # rendering the original.
+        self.name = tag.name
+        self.add_ws = tag.add_ws
+        self.attrs = tag.attrs
+        self.children = tag.children
+        self.prev_displayhook = None
+        self._tag = tag
+        self._deps = tag.get_dependencies(dedup=False)
+        # Rendered HTML, keyed by (indent, eol, minify). The output of a tag depends
+        # only on these, so this usually has just one or two entries.
+        self._html: dict[tuple[int, str, bool], str] = {}
+
+    def tagify(self) -> "_FrozenTag":
+        return self
+
+    def get_html_string(
+        self, indent: int = 0, eol: str = "\n", *, minify: bool = False
+    ) -> str:
+        key = (indent, eol, minify)
+        html_ = self._html.get(key)
+        if html_ is None:
+            html_ = self._html[key] = self._tag.get_html_string(
+                indent, eol, minify=minify
+            )
+        return html_
+
+    def get_dependencies(self, dedup: bool = True) -> list[HTMLDependency]:
+        if dedup:
+            return _resolve_dependencies(self._deps)
+        else:
+            return list(self._deps)
+
+    def __eq__(self, other: Any) -> bool:
+        return _equals_impl(self, other, ignore=("_html",))
+
+
+# =============================================================================
+# Lazy children
+# =============================================================================
+class Lazy:
+    """
+    Children which are generated while the HTML is written.
+
+    The items of ``x`` are not iterated over until the HTML is written (for example, by
+    :meth:`Tag.iter_html` or :meth:`Tag.write_html`), and each one is written as soon
+    as it is generated. With a generator, this means that a page with a very large
+    number of children can be streamed without ever holding all of them in memory.
+
+    Iterators (including generators) that are passed as children to tag functions are
+    wrapped in ``Lazy`` automatically.
+
+    Parameters
+    ----------
+    x
+        An iterable of tag children.
+
+    Note
+    ----
+    If ``x`` is an iterator, it can only be consumed once, so the tag that contains it
+    can only be rendered once.
+
+    :meth:`Tag.get_dependencies` doesn't look inside of ``Lazy`` objects, since that
+    would consume them. ``.render()`` does collect the HTML dependencies generated by
+    them, but an :class:`HTMLDocument` can't include those dependencies in its
+    ``<head>``, which is written before its body.
+
+    Examples
+    --------
+    >>> from htmltools import Lazy, div, tags
+    >>> rows = (tags.li(f"Item {i}") for i in range(2))
+    >>> tags.ul(Lazy(rows))
+    <ul>
+      <li>Item 0</li>
+      <li>Item 1</li>
+    </ul>
+    """
+
+    def __init__(self, x: Iterable[TagChild]) -> None:
+        self._x = x
+
+    def __iter__(self) -> Iterator[TagChild]:
+        return iter(self._x)
+
+    def tagify(self) -> "Lazy":
+        """
+        Return a new ``Lazy`` object, which tagifies each item as it is generated.
+        """
+        return Lazy(_tagify_lazy(self))
+
+
+def _tagify_lazy(x: Lazy) -> Iterator[TagNode]:
+    for item in x:
+        yield from TagList(item).tagify()
+
+
+def _lazy_nodes(x: Lazy, tagify: bool) -> Iterator[TagNode]:
+    # The TagNodes generated by a Lazy object, for _iter_html(). If `tagify` is True,
+    # one level of them is tagified, like the other children being written.
+    for item in x:
+        nodes = _tagchilds_to_tagnodes((item,))
+        if tagify:
+            nodes = _tagify_children(nodes)
+        yield from nodes
+
+
+def _expand_lazy(children: Iterable[TagNode], tagify: bool) -> Iterator[TagNode]:
+    # Yield the children, with the nodes generated by Lazy objects in place of them, as
+    # if they had been children all along. Lazy objects may generate more Lazy objects,
+    # so they're expanded with a stack of iterators instead of nesting generators.
+    stack: list[Iterator[TagNode]] = [iter(children)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Lazy):
+                stack.append(_lazy_nodes(child, tagify))
+                break
+            yield child
+        else:
+            stack.pop()
+
+
+def _peek_lazy(
+    children: Iterable[TagNode], tagify: bool
+) -> tuple[list[TagNode], Iterator[TagNode]]:
+    # Expand the Lazy objects in `children` until it's known whether there are none,
+    # one, or more children to write (other than MetadataNodes), so that the tag
+    # holding them is written the same way as if they had been generated up front.
+    # Return the children expanded so far, and an iterator over the rest.
+    rest = _expand_lazy(children, tagify)
+    head: list[TagNode] = []
+    n = 0
+    for child in rest:
+        head.append(child)
+        if not isinstance(child, MetadataNode):
+            n += 1
+            if n == 2:
+                break
+    return head, rest
+
+
+# =============================================================================
+# Columnar tables
+# =============================================================================
+def table_from_columns(
+    data: Mapping[str, Iterable[object]],
+    *args: TagChild | TagAttrs,
+    header: bool = True,
+    **kwargs: TagAttrValue,
+) -> Tag:
+    """
+    Create a `<table>` tag from columns of data.
+
+    The body of the table is written directly from the data, without creating a
+    :class:`~htmltools.Tag` for each row and cell, so this is much faster than building
+    a large table out of ``tags.tr()`` and ``tags.td()``. The result renders the same
+    as the equivalent table of tags.
+
+    Parameters
+    ----------
+    data
+        A mapping from column names to the values in each column, like a ``dict`` of
+        lists or of NumPy arrays, or a pandas ``DataFrame``. Values can be strings,
+        numbers, ``None`` (an empty cell), or :class:`~htmltools.HTML` (which is
+        written as-is). Other values are converted with ``str()``. All of the columns
+        must have the same length.
+    *args
+        Child elements of the `<table>` tag, like a ``tags.caption()`` or HTML
+        dependencies. These are written before the header.
+    header
+        Whether to write a `<thead>` with the column names.
+    **kwargs
+        Attributes of the `<table>` tag.
+
+    Returns
+    -------
+    :
+        A :class:`~htmltools.Tag` object.
+
+    Examples
+    --------
+    >>> from htmltools import table_from_columns
+    >>> table_from_columns({"x": [1, 2], "y": ["a", "<b>"]}, class_="table")
+    <table class="table">
+      <thead>
+        <tr>
+          <th>x</th>
+          <th>y</th>
+        </tr>
+      </thead>
+      <tbody>
+        <tr>
+          <td>1</td>
+          <td>a</td>
+        </tr>
+        <tr>
+          <td>2</td>
+          <td>&lt;b&gt;</td>
+        </tr>
+      </tbody>
+    </table>
+    """
+
+    names: list[str] = []
+    columns: list[list[str]] = []
+    for name, values in data.items():
+        names.append(str(name))
+        columns.append(_table_cells(values))
+
+    if any(len(col) != len(columns[0]) for col in columns):
+        raise ValueError("All columns of `data` must have the same length.")
+
+    children: list[TagChild | TagAttrs] = list(args)
+    if header:
+        children.append(Tag("thead", Tag("tr", *[Tag("th", name) for name in names])))
+    children.append(_TableBody(tuple(columns)))
+    return Tag("table", *children, **kwargs)
+
+
+def _table_cells(values: Iterable[object]) -> list[str]:
+    # The HTML of each cell in a column. Plain strings are escaped all at once.
+    tolist = getattr(values, "tolist", None)
+    if callable(tolist):
+        # NumPy arrays and pandas Series: converting them to lists of Python objects at
+        # once is much faster than iterating over them.
+        values = cast(Iterable[object], tolist())
+    text: list[str] = []
+    html_cells: list[tuple[int, str]] = []
+    for val in values:
+        if isinstance(val, str):
+            text.append(val)
+        elif val is None:
+            text.append("")
+        elif isinstance(val, HTML):
+            html_cells.append((len(text), val.as_string()))
+            text.append("")
+        else:
+            text.append(str(val))
+    cells = html_escape_many(text)
+    for i, html_ in html_cells:
+        cells[i] = html_
+    return cells
+
+
+class _TableBody(Tag):
+    """
+    A `<tbody>` whose rows are written directly from columns of cell HTML. See
+    table_from_columns().
+    """
+
+    def __init__(self, columns: tuple[list[str], ...]) -> None:
+        super().__init__("tbody")
+        # A tuple, so that copying the tag (as tagify() does) doesn't copy the columns.
+        self._columns = columns
+
+    def get_html_string(
+        self, indent: int = 0, eol: str = "\n", *, minify: bool = False
+    ) -> str:
+        rows = zip(*self._columns)
+        if minify:
+            return (
+                "<tbody>"
+                + "".join(
+                    "<tr><td>" + "</td><td>".join(row) + "</td></tr>" for row in rows
+                )
+                + "</tbody>"
+            )
+
+        indent_str = _indent_str(indent)
+        if not self._columns or not self._columns[0]:
+            return indent_str + "<tbody></tbody>"
+        tr_open = indent_str + "  <tr>" + eol + indent_str + "    <td>"
+        td_sep = "</td>" + eol + indent_str + "    <td>"
+        tr_close = "</td>" + eol + indent_str + "  </tr>"
+        return (
+            indent_str
+            + "<tbody>"
+            + eol
+            + eol.join(tr_open + td_sep.join(row) + tr_close for row in rows)
+            + eol
+            + indent_str
+            + "</tbody>"
+        )
+
+
+# Tags that have the form <tagname />
+_VOID_TAG_NAMES = {
+    "area",
+    "base",
+    "br",
+    "col",
+    "command",
+    "embed",
+    "hr",
+    "img",
+    "input",
+    "keygen",
+    "link",
+    "meta",
+    "param",
+    "source",
+    "track",
+    "wbr",
+}
+
+_NO_ESCAPE_TAG_NAMES = {"script", "style"}
+
+# How text is escaped within tags that aren't parsed as HTML
+_TAG_CONTENT_ESCAPERS: dict[str, Callable[[str], str]] = {
+    "script": escape_script,
+    "style": escape_style,
+}
+
+# Tags whose whitespace is significant, so it isn't collapsed when minifying
+_PRESERVE_WS_TAG_NAMES = {"pre", "textarea", "script", "style"}
+
+# Characters that can't appear in an unquoted attribute value
+# https://html.spec.whatwg.org/multipage/syntax.html#unquoted
+_UNSAFE_UNQUOTED_ATTR = re.compile(r"[\s\"'=<>`]")
+
+_DOCTYPE = "<!DOCTYPE html>\n"
+
+
+# =============================================================================
+# Render cache
+# =============================================================================
+class RenderCache:
+    """
+    A cache of rendered tags.
+
+    When a render cache is in use (see :func:`set_render_cache`), ``.render()`` looks up
+    each tag in the cache by its structure: its name, attributes, and children
+    (including any HTML dependencies). If an identical tag has been rendered before, its
+    HTML and dependencies are reused instead of being rendered again. This helps when
+    the same tags, like cards, icons, or table rows, are rebuilt and rendered for
+    every page.
+
+    Tags which contain objects that may render differently each time (like Tagifiable
+    objects other than tags, objects with a ``_repr_html_()`` method, or subclasses of
+    Tag) are not cached, but tags inside of them can be.
+
+    Parameters
+    ----------
+    maxsize
+        The maximum number of rendered tags to keep.
+    policy
+        Which entry to evict when the cache is full. With ``"lru"``, the least recently
+        used entry is evicted; with ``"fifo"``, the oldest entry is evicted.
+
+    Attributes
+    ----------
+    hits
+        The number of times a tag was found in the cache.
+    misses
+        The number of times a tag was not found in the cache.
+
+    Examples
+    --------
+    >>> from htmltools import RenderCache, set_render_cache, div
+    >>> cache = RenderCache(maxsize=100)
+    >>> _ = set_render_cache(cache)
+    >>> _ = div(div("card"), div("card")).render()
+    >>> (cache.hits, cache.misses)
+    (1, 2)
+    >>> _ = set_render_cache(None)
+    """
+
+    def __init__(
+        self, maxsize: int = 1024, policy: Literal["lru", "fifo"] = "lru"
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer.")
+        if policy not in ("lru", "fifo"):
+            raise ValueError('`policy` must be "lru" or "fifo".')
+
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[object, tuple[str, list[HTMLDependency]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache, and reset the hit and miss counts.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _get(self, key: object) -> Optional[tuple[str, list[HTMLDependency]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.policy == "lru":
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key: object, html: str, deps: list[HTMLDependency]) -> None:
+        with self._lock:
+            self._entries[key] = (html, deps)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+_render_cache: Optional[RenderCache] = None
+
+
+def set_render_cache(cache: Optional[RenderCache]) -> Optional[RenderCache]:
+    """
+    Set the cache used when rendering tags.
+
+    Parameters
+    ----------
+    cache
+        A :class:`RenderCache`, or ``None`` to stop caching.
+
+    Returns
+    -------
+    :
+        The previous cache (or ``None``), so that it can be restored.
+    """
+    global _render_cache
+    old = _render_cache
+    _render_cache = cache
+    return old
+
+
+# Markers for HTML strings and HTML dependencies in the keys of RenderCache entries.
+# (Plain strings are used as they are.)
+_HTML_KEY = object()
+_DEP_KEY = object()
+
+
+class _CacheKey:
+    # The RenderCache key of a tag. Keys are nested (a tag's key holds the keys of its
+    # child tags), so the hash is computed once, when the key is made, from the cached
+    # hashes of the child keys. That way, finding the keys of every tag in a tree and
+    # looking them up takes linear time, instead of hashing each subtree again for
+    # every ancestor.
+    __slots__ = ("value", "hash")
+
+    def __init__(self, value: tuple[object, ...]) -> None:
+        self.value = value
+        self.hash = hash(value)
+
+    def __hash__(self) -> int:
+        return self.hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, _CacheKey) or self.hash != other.hash:
+            return False
+        # Compare with an explicit stack instead of recursion, for deep trees.
+        stack = [(self.value, other.value)]
+        while stack:
+            a, b = stack.pop()
+            if len(a) != len(b):
+                return False
+            for x, y in zip(a, b):
+                if isinstance(x, _CacheKey) and isinstance(y, _CacheKey):
+                    if x is not y:
+                        if x.hash != y.hash:
+                            return False
+                        stack.append((x.value, y.value))
+                elif x != y:
+                    return False
+        return True
+
+
+class _KeyFrame:
+    # The state of _RenderCacheKeys while it finds the keys of one tag's children.
+    __slots__ = ("tag", "children", "parts")
+
+    def __init__(self, tag: Optional[Tag], children: Iterator[TagNode]) -> None:
+        self.tag = tag
+        self.children = children
+        # The keys of the children, or None if one of them can't be cached.
+        self.parts: Optional[list[object]] = [] if type(tag) is Tag else None
+
+
+class _RenderCacheKeys:
+    # The RenderCache keys of all the tags in a tree that can be cached.
+
+    def __init__(self, cache: RenderCache, x: Tag | TagList) -> None:
+        self.cache = cache
+        self._keys: dict[int, _CacheKey] = {}
+        if isinstance(x, Tag):
+            stack = [_KeyFrame(x, iter(x.children))]
+        else:
+            stack = [_KeyFrame(None, iter(x))]
+
+        # Keys are built bottom-up: a tag's key includes the keys of its children.
+        while stack:
+            frame = stack[-1]
+            for child in frame.children:
+                if type(child) is Tag:
+                    stack.append(_KeyFrame(child, iter(child.children)))
+                    break
+                if frame.parts is None:
+                    continue
+                if isinstance(child, str):
+                    frame.parts.append(child)
+                elif isinstance(child, HTML):
+                    frame.parts.append((_HTML_KEY, child.as_string()))
+                elif isinstance(child, HTMLDependency):
+                    frame.parts.append(_dependency_key(child))
+                else:
+                    frame.parts = None
+
+            else:
+                stack.pop()
+                tag = frame.tag
+                if tag is None:
+                    continue
+                key = None
+                if frame.parts is not None:
+                    key = _CacheKey(
+                        (tag.name, tag.add_ws, _attrs_key(tag), *frame.parts)
+                    )
+                    self._keys[id(tag)] = key
+                if stack:
+                    parent = stack[-1]
+                    if parent.parts is not None:
+                        if key is None:
+                            parent.parts = None
+                        else:
+                            parent.parts.append(key)
+
+    def get(
+        self, x: Tag, indent: int, eol: str, minify: bool, collapse_ws: bool
+    ) -> Optional[object]:
+        # A tag's HTML also depends on how it's written.
+        key = self._keys.get(id(x))
+        if key is None:
+            return None
+        return (key, indent, eol, minify, collapse_ws)
+
+
+def _attrs_key(x: Tag) -> tuple[tuple[str, object], ...]:
+    return tuple(
+        (k, v if isinstance(v, str) else (_HTML_KEY, str(v)))
+        for k, v in x.attrs.items()
+    )
+
+
+def _dependency_key(x: HTMLDependency) -> object:
+    # Dependencies are often created anew for each page, so they're keyed by value. The
+    # head is keyed by identity, because it may contain objects that haven't been
+    # tagified.
+    return (
+        _DEP_KEY,
+        repr([(k, id(v) if k == "head" else v) for k, v in x.__dict__.items()]),
+    )
+
+
+class _CacheStore:
+    # A marker on _iter_html()'s stack: when it's reached, the HTML written for a tag
+    # (from out[start:]) and its dependencies (from deps[deps_start:]) are stored in the
+    # cache.
+    __slots__ = ("cache", "key", "start", "deps_start")
+
+    def __init__(
+        self, cache: RenderCache, key: object, start: int, deps_start: int
+    ) -> None:
+        self.cache = cache
+        self.key = key
+        self.start = start
+        self.deps_start = deps_start
+
+    def store(self, out: list[str], deps: list[HTMLDependency]) -> None:
+        html = "".join(out[self.start :])
+        # Replace the pieces with the joined string, so they aren't joined twice.
+        del out[self.start :]
+        out.append(html)
+        self.cache._put(  # pyright: ignore[reportPrivateUsage]
+            self.key, html, deps[self.deps_start :]
+        )
+
+
+# =============================================================================
+# Tree traversal
+# =============================================================================
+#
+# Tagifying, collecting dependencies, and writing HTML (see _iter_html()) all walk Tag
+# trees with explicit stacks instead of recursion, so that deeply nested trees don't hit
+# Python's recursion limit or pay for a function call at every level. The stack holds
+# iterators over the children being visited: descending into a Tag pushes an iterator
+# over its children, and when that iterator is exhausted it is popped, and the walk
+# resumes the parent's iterator where it left off.
+
+
+def _collect_dependencies(x: Iterable[TagNode], deps: list[HTMLDependency]) -> None:
+    # Append the HTMLDependency objects in a (tagified) tree to `deps`, in document
+    # order.
+    stack: list[Iterator[TagNode]] = [iter(x)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, HTMLDependency):
+                deps.append(child)
+            elif isinstance(child, Tag):
+                if type(child).get_dependencies is Tag.get_dependencies:
+                    stack.append(iter(child.children))
+                    break
+                # Subclasses may override get_dependencies(). Don't deduplicate at
+                # every node; that happens once, at the top level.
+                deps.extend(child.get_dependencies(dedup=False))
+        else:
+            stack.pop()
+
+
+def _needs_tagify(x: TagList) -> bool:
+    return x._needs_tagify()  # pyright: ignore[reportPrivateUsage]
+
+
+def _tagify_in_place(x: TagList, deps: Optional[list[HTMLDependency]] = None) -> None:
+    # Tagify the children of `x`, which must be a fresh (shallow) copy that is safe to
+    # modify. Tag children are copied and their children are tagified the same way,
+    # except for Tags with nothing under them to tagify, which are shared with the
+    # original tree. If `deps` is not None, the HTMLDependency objects in the tagified
+    # tree are appended to it, in document order.
+    for _ in _tagify_in_place_steps(x, deps):
+        pass
+
+
+# The number of children _tagify_in_place_steps() handles between steps.
+_TAGIFY_STEP_SIZE = 1000
+
+
+def _tagify_in_place_steps(
+    x: TagList, deps: Optional[list[HTMLDependency]] = None
+) -> Iterator[None]:
+    # Like _tagify_in_place(), but yields every _TAGIFY_STEP_SIZE children, so that an
+    # async caller can give other tasks a chance to run while a large tree is tagified.
+    if not _needs_tagify(x):
+        return
+    n = 0
+
+    # Each stack entry holds an iterator over the original children of a TagList, the
+    # new list of tagified children being built for it, and the TagList itself. A new
+    # list is built instead of splicing into the old one, because a Tagifiable object
+    # may be replaced with 0, 1, or more items (if it returns a TagList).
+    stack: list[tuple[Iterator[TagNode], list[TagNode], TagList]] = [(iter(x), [], x)]
+    while stack:
+        children, result, tag_list = stack[-1]
+        for child in children:
+            n += 1
+            if n == _TAGIFY_STEP_SIZE:
+                n = 0
+                yield
+            if isinstance(child, Tag) and type(child).tagify is Tag.tagify:
+                if (
+                    deps is not None
+                    and type(child).get_dependencies is not Tag.get_dependencies
+                ):
+                    cp = child.tagify()
+                    result.append(cp)
+                    deps.extend(cp.get_dependencies(dedup=False))
+                elif _needs_tagify(child.children):
+                    cp = copy(child)
+                    result.append(cp)
+                    stack.append((iter(cp.children), [], cp.children))
+                    break
+                else:
+                    result.append(child)
+
+            elif _node_kind(child) & _KIND_TAGIFIABLE:
+                tagified_child = cast(Tagifiable, child).tagify()
+                if isinstance(tagified_child, TagList):
+                    # If the Tagifiable object returned a TagList, flatten it into this
+                    # one.
+                    nodes = _tagchilds_to_tagnodes(tagified_child)
+                else:
+                    nodes = [tagified_child]
+                result.extend(nodes)
+                if deps is not None:
+                    _collect_dependencies(nodes, deps)
+
+            elif isinstance(child, MetadataNode):
+                cp = copy(child)
+                result.append(cp)
+                if deps is not None and isinstance(cp, HTMLDependency):
+                    deps.append(cp)
 
-        Parameters
-        ----------
-        style
-            CSS properties and values already properly formatted. Each should already
-            contain trailing semicolons.
-        prepend
-            Bool that determines if the `style` is added to the beginning or end of the
-            style attribute.
+            else:
+                result.append(child)
 
-        See Also
-        --------
-        ~htmltools.css
+        else:
+            tag_list.data = result
+            # This is a new copy, so no other cached results depend on it.
+            tag_list._tagify_gen = -1  # pyright: ignore[reportPrivateUsage]
+            stack.pop()
+
+
+def _tagify_with_dependencies_steps(
+    x: TagT,
+) -> Generator[None, None, tuple[TagT, list[HTMLDependency]]]:
+    # Like x.tagify() followed by get_dependencies() on the result, but with a single
+    # walk of the tree. Run with _run_steps() or _arun_steps().
+    if (
+        type(x).tagify is not Tag.tagify
+        or type(x).get_dependencies is not Tag.get_dependencies
+    ):
+        cp = x.tagify()
+        return cp, cp.get_dependencies()
 
-        Returns
-        -------
-        :
-            The modified tag.
-        """
+    cp = copy(x)
+    deps: list[HTMLDependency] = []
+    yield from _tagify_in_place_steps(cp.children, deps)
+    return cp, _resolve_dependencies(deps)
 
-        if isinstance(  # type: ignore[reportUnnecessaryIsInstance]
-            style, (str, HTML)
-        ) and not style.endswith(";"):
-            raise ValueError("`Tag.add_style(style=)` must end with a semicolon")
 
-        if prepend:
-            self.attrs.update({"style": style}, {"style": self.attrs.get("style")})
-        else:
-            self.attrs.update({"style": self.attrs.get("style")}, {"style": style})
-        return self
+def _run_steps(steps: Generator[None, None, T]) -> T:
+    # Run a generator of steps (see _tagify_in_place_steps()) to the end, and return
+    # its result.
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
 
-    def tagify(self: TagT) -> TagT:
-        """
-        Convert any tagifiable children to Tag/TagList objects.
-        """
 
-        cp = copy(self)
-        cp.children = cp.children.tagify()
-        return cp
+async def _arun_steps(steps: Generator[None, None, T]) -> T:
+    # Like _run_steps(), but let other tasks run between steps.
+    while True:
+        try:
+            next(steps)
+        except StopIteration as e:
+            return e.value
+        await asyncio.sleep(0)
 
-    def get_html_string(self, indent: int = 0, eol: str = "\n") -> str:
-        """
-        Get the HTML string representation of the tag.
 
-        Parameters
-        ----------
-        indent
-            The number of spaces to indent the tag.
-        eol
-            The end-of-line character(s).
-        """
+# Indentation strings, indexed by indentation level. Grown on demand by _indent_str().
+_INDENT_STRS: list[str] = ["  " * i for i in range(16)]
 
-        indent_str = "  " * indent
-        html_ = indent_str + "<" + self.name
 
-        # Write attributes
-        for key, val in self.attrs.items():
-            if not isinstance(val, HTML):
-                val = html_escape(val, attr=True)
-            html_ += f' {key}="{val}"'
+def _indent_str(indent: int) -> str:
+    if indent < len(_INDENT_STRS):
+        return _INDENT_STRS[indent] if indent >= 0 else ""
+    while len(_INDENT_STRS) <= indent:
+        _INDENT_STRS.append("  " * len(_INDENT_STRS))
+    return _INDENT_STRS[indent]
 
-        # Dependencies are ignored in the HTML output
-        children = [x for x in self.children if not isinstance(x, MetadataNode)]
 
-        # Don't enclose JSX/void elements if there are no children
-        if len(children) == 0 and self.name in _VOID_TAG_NAMES:
-            return html_ + "/>"
+class _HTMLFrame:
+    # The state of _iter_html() while it writes out the children of one TagList.
+    __slots__ = (
+        "children",
+        "indent",
+        "eol",
+        "escape",
+        "prev_was_add_ws",
+        "first",
+        "minify",
+        "collapse_ws",
+    )
+
+    def __init__(
+        self,
+        children: Iterator[TagNode],
+        indent: int,
+        eol: str,
+        escape: Optional[Callable[[str], str]],
+        add_ws: bool,
+        minify: bool = False,
+        collapse_ws: bool = False,
+    ) -> None:
+        self.children = children
+        self.indent = indent
+        self.eol = eol
+        self.escape = escape
+        self.prev_was_add_ws = add_ws
+        self.first = True
+        self.minify = minify
+        # Whether whitespace-only text should be collapsed (when minifying, outside of
+        # <pre> and the like).
+        self.collapse_ws = collapse_ws
+
+
+def _write_html(
+    x: Tag | TagList,
+    out: list[str],
+    indent: int,
+    eol: str,
+    *,
+    add_ws: bool = True,
+    escape: bool = True,
+    deps: Optional[list[HTMLDependency]] = None,
+    cache: Optional[RenderCache] = None,
+    minify: bool = False,
+) -> None:
+    """Append the HTML for a Tag or TagList to `out`."""
+    # Without a chunk size, _iter_html() writes everything to `out` and never yields.
+    for _ in _iter_html(
+        x,
+        out,
+        indent,
+        eol,
+        None,
+        add_ws=add_ws,
+        escape=escape,
+        deps=deps,
+        cache=cache,
+        minify=minify,
+    ):
+        pass
+
+
+def _render(x: Tag | TagList, minify: bool = False) -> RenderedHTML:
+    # Tagify, write the HTML, and collect the dependencies in a single walk of the
+    # tree. Unlike x.tagify(), this doesn't copy the Tag objects in the tree.
+    html_: list[str] = []
+    deps: list[HTMLDependency] = []
+    _write_html(x, html_, 0, "\n", deps=deps, cache=_render_cache, minify=minify)
+    # x.tagify() would have copied the dependencies, so do the same here, so that
+    # callers can't modify the ones in the tree.
+    return {
+        "dependencies": [copy(d) for d in _resolve_dependencies(deps)],
+        "html": "".join(html_),
+    }
 
-        # Other empty tags are enclosed
-        html_ += ">"
-        close = "</" + self.name + ">"
-        if len(children) == 0:
-            return html_ + close
 
-        # Inline a single/empty child text node
-        if len(children) == 1 and isinstance(children[0], (str, HTML)):
-            if self.name in _NO_ESCAPE_TAG_NAMES:
-                return html_ + str(children[0]) + close
+def _tagify_children(x: Iterable[TagNode]) -> list[TagNode]:
+    # Tagify one level of children: Tagifiable objects (other than Tags) are replaced
+    # with the result of calling their tagify() method. Tags are left as they are;
+    # _iter_html() tagifies their children when it gets to them.
+    result: list[TagNode] = []
+    for child in x:
+        if (isinstance(child, Tag) and type(child).tagify is Tag.tagify) or isinstance(
+            child, Lazy
+        ):
+            result.append(child)
+        elif _node_kind(child) & _KIND_TAGIFIABLE:
+            tagified_child = cast(Tagifiable, child).tagify()
+            if isinstance(tagified_child, TagList):
+                result.extend(_tagchilds_to_tagnodes(tagified_child))
             else:
-                return html_ + _normalize_text(children[0]) + close
+                result.append(tagified_child)
+        else:
+            result.append(child)
+    return result
+
+
+def _iter_html(
+    x: Tag | TagList,
+    out: list[str],
+    indent: int,
+    eol: str,
+    chunk_size: Optional[int],
+    *,
+    add_ws: bool = True,
+    escape: bool = True,
+    deps: Optional[list[HTMLDependency]] = None,
+    cache: Optional[RenderCache] = None,
+    minify: bool = False,
+) -> Iterator[str]:
+    """
+    Write the HTML for a Tag or TagList to `out`.
+
+    The tree is walked with an explicit stack, so that all of the pieces of the HTML
+    are appended to the same list no matter how deeply nested the tree is. If
+    `chunk_size` is not None, then whenever at least that many characters have
+    accumulated in `out`, they are joined, yielded, and `out` is cleared. Anything left
+    over in `out` at the end is up to the caller.
+
+    If `deps` is None, the tree must already be tagified. Otherwise, the tree is
+    tagified as it is walked, and the HTMLDependency objects in it are appended to
+    `deps` in document order, so that a single walk does the work of tagify(),
+    get_dependencies(), and get_html_string().
 
-        # Write children
-        if self.add_ws:
-            html_ += eol
+    If `cache` is not None (which requires `deps`, and no `chunk_size`), the HTML and
+    dependencies of Tag subtrees are looked up in it, and stored in it on a miss.
 
-        html_ += self.children.get_html_string(
-            indent=indent + 1,
-            eol=eol,
-            add_ws=self.add_ws,
-            _escape_strings=(self.name not in _NO_ESCAPE_TAG_NAMES),
+    If `minify` is True, `indent`, `eol`, and `add_ws` are ignored, and compact HTML is
+    written (see Tag.get_html_string()).
+    """
+    # The stack holds _HTMLFrame objects for the children being written, the closing
+    # tag strings to write once those children are done, and _CacheStore markers for
+    # tags whose output should be stored in the cache once it's written.
+    stack: list[_HTMLFrame | str | _CacheStore] = []
+    cache_keys = None if cache is None else _RenderCacheKeys(cache, x)
+    if minify:
+        # With no add_ws anywhere, the tags are written with no indentation and no
+        # line breaks.
+        indent, eol, add_ws = 0, "", False
+    if isinstance(x, Tag):
+        _open_tag(x, out, indent, eol, stack, deps, cache_keys, minify, minify)
+    else:
+        children = x.data
+        if deps is not None:
+            if _needs_tagify(x):
+                children = _tagify_children(x)
+        stack.append(
+            _HTMLFrame(
+                (
+                    _expand_lazy(children, deps is not None)
+                    if Lazy in map(type, children)
+                    else iter(children)
+                ),
+                indent,
+                eol,
+                cached_escape_text if escape else None,
+                add_ws,
+                minify,
+                minify,
+            )
         )
 
-        if self.add_ws:
-            html_ += eol + indent_str
+    size = 0
+    n_sized = 0
+
+    while stack:
+        frame = stack[-1]
+        if isinstance(frame, str):
+            out.append(frame)
+            stack.pop()
+            continue
+
+        if isinstance(frame, _CacheStore):
+            frame.store(out, cast(list[HTMLDependency], deps))
+            stack.pop()
+            continue
+
+        child = next(frame.children, None)
+        if child is None:
+            stack.pop()
+            continue
+
+        if isinstance(child, MetadataNode):
+            if deps is not None and isinstance(child, HTMLDependency):
+                deps.append(child)
+            continue
+
+        # True if the previous and current node are inline; False otherwise. This
+        # affects whether or not we add whitespace and indentation.
+        prev_or_current_add_ws = frame.prev_was_add_ws or (
+            (isinstance(child, Tag) and child.add_ws and not frame.minify)
+        )
 
-        return html_ + close
+        if frame.first:
+            frame.first = False
+        elif prev_or_current_add_ws:
+            out.append(frame.eol)
 
-    def render(self) -> RenderedHTML:
-        """
-        Get string representation as well as its HTML dependencies.
-        """
-        cp = self.tagify()
-        deps = cp.get_dependencies()
-        return {"dependencies": deps, "html": cp.get_html_string()}
+        if isinstance(child, Tag):
+            # Note that we don't pass `escape` along, because how the children of a
+            # tag are escaped depends only on that tag (see _TAG_CONTENT_ESCAPERS).
+            if prev_or_current_add_ws:
+                _open_tag(child, out, frame.indent, frame.eol, stack, deps, cache_keys)
+            else:
+                _open_tag(
+                    child,
+                    out,
+                    0,
+                    "",
+                    stack,
+                    deps,
+                    cache_keys,
+                    frame.minify,
+                    frame.collapse_ws,
+                )
 
-    def save_html(
-        self, file: str, *, libdir: Optional[str] = "lib", include_version: bool = True
-    ) -> str:
-        """
-        Save to a HTML file.
+            frame.prev_was_add_ws = child.add_ws and not frame.minify
 
-        Parameters
-        ----------
-        file
-            The file to save to.
-        libdir
-            The directory to save the dependencies to.
-        include_version
-            Whether to include the version number in the dependency folder name.
+        elif _node_kind(child) & _KIND_REPR_HTML:
+            if frame.prev_was_add_ws:
+                out.append(_indent_str(frame.indent))
 
-        Returns
-        -------
-        The path to the generated HTML file.
-        """
+            repr_child = cast(ReprHtml, child)
+            out.append(repr_child._repr_html_())  # pyright: ignore[reportPrivateUsage]
 
-        return HTMLDocument(self).save_html(
-            file, libdir=libdir, include_version=include_version
-        )
+            frame.prev_was_add_ws = False
 
-    def get_dependencies(self, dedup: bool = True) -> list["HTMLDependency"]:
-        """
-        Get any HTML dependencies.
-        """
-        return self.children.get_dependencies(dedup=dedup)
+        elif _node_kind(child) & _KIND_TAGIFIABLE:
+            raise RuntimeError(
+                "Encountered a non-tagified object. x.tagify() must be called before x.render()"
+            )
 
-    def show(self, renderer: Literal["auto", "ipython", "browser"] = "auto") -> object:
-        """
-        Preview as a complete HTML document.
+        else:
+            # If we get here, x must be a string.
+            text = cast(str, child)
+            if frame.prev_was_add_ws:
+                out.append(_indent_str(frame.indent))
+
+            if frame.collapse_ws and text.isspace():
+                out.append(" ")
+            elif frame.escape is not None:
+                out.append(frame.escape(text))
+            else:
+                out.append(text)
+
+            frame.prev_was_add_ws = False
+
+        if chunk_size is not None:
+            n = len(out)
+            size += sum(map(len, out[n_sized:]))
+            n_sized = n
+            if size >= chunk_size:
+                yield "".join(out)
+                out.clear()
+                size = n_sized = 0
+
+
+def _attrs_html(attrs: Mapping[str, str | HTML], minify: bool) -> str:
+    res: list[str] = []
+    for key, val in attrs.items():
+        if not isinstance(val, HTML):
+            val = cached_escape_attr(val)
+        if not minify:
+            res.append(f' {key}="{val}"')
+        elif not val:
+            res.append(" " + key)
+        elif _UNSAFE_UNQUOTED_ATTR.search(str(val)) is None:
+            res.append(f" {key}={val}")
+        else:
+            res.append(f' {key}="{val}"')
+    return "".join(res)
 
-        Parameters
-        ----------
-        renderer
-            The renderer to use.
-        """
-        _tag_show(self, renderer)
 
-    def __eq__(self, other: Any) -> bool:
-        return _equals_impl(self, other)
+# Whether each Tag subclass's get_html_string() takes a `minify` argument. See
+# _accepts_minify().
+_minify_support: dict[type, bool] = {}
 
-    def __str__(self) -> str:
-        return _render_tag_or_taglist(self)
 
-    def __repr__(self) -> str:
-        return str(self)
+def _accepts_minify(cls: type[Tag]) -> bool:
+    # Subclasses that override get_html_string() may have been written before the
+    # `minify` argument was added, so it's only passed along to those that take it.
+    accepts = _minify_support.get(cls)
+    if accepts is None:
+        try:
+            params = inspect.signature(cls.get_html_string).parameters.values()
+        except (TypeError, ValueError):
+            accepts = False
+        else:
+            accepts = any(
+                p.name == "minify" or p.kind is inspect.Parameter.VAR_KEYWORD
+                for p in params
+            )
+        if len(_minify_support) >= 1000:
+            # Don't hold on to classes created on the fly forever.
+            _minify_support.clear()
+        _minify_support[cls] = accepts
+    return accepts
+
+
+def _open_tag(
+    x: Tag,
+    out: list[str],
+    indent: int,
+    eol: str,
+    stack: list[_HTMLFrame | str | _CacheStore],
+    deps: Optional[list[HTMLDependency]] = None,
+    cache_keys: Optional[_RenderCacheKeys] = None,
+    minify: bool = False,
+    collapse_ws: bool = False,
+) -> None:
+    # Write the opening tag for `x`. If `x` has children that need to be written
+    # separately, push them onto `stack`, along with the closing tag to write after
+    # them. Otherwise, write the whole tag. If `deps` is not None, `x` may not be
+    # tagified yet (see _iter_html()). When minifying, `indent` must be 0 and `eol`
+    # must be "".
+
+    if cache_keys is not None:
+        deps = cast(list[HTMLDependency], deps)
+        key = cache_keys.get(x, indent, eol, minify, collapse_ws)
+        if key is not None:
+            entry = cache_keys.cache._get(key)  # pyright: ignore[reportPrivateUsage]
+            if entry is not None:
+                out.append(entry[0])
+                deps.extend(entry[1])
+                return
+            # Write the tag as usual, and store the result once it's written.
+            store = _CacheStore(cache_keys.cache, key, len(out), len(deps))
+            n = len(stack)
+            stack.append(store)
+            _open_tag(x, out, indent, eol, stack, deps, None, minify, collapse_ws)
+            if len(stack) == n + 1:
+                # The whole tag has already been written.
+                stack.pop()
+                store.store(out, deps)
+            return
+
+    # Subclasses of Tag may override get_html_string() or get_dependencies(); respect
+    # that.
+    if type(x).get_html_string is not Tag.get_html_string or (
+        deps is not None and type(x).get_dependencies is not Tag.get_dependencies
+    ):
+        if deps is not None:
+            x = x.tagify()
+            deps.extend(x.get_dependencies(dedup=False))
+        if minify and _accepts_minify(type(x)):
+            out.append(x.get_html_string(indent, eol, minify=True))
+        else:
+            out.append(x.get_html_string(indent, eol))
+        return
 
-    def _repr_html_(self) -> str:
-        return str(self)
+    indent_str = _indent_str(indent)
+    out.append(indent_str + "<" + x.name)
 
+    # Write attributes
+    attrs = x.attrs
+    if isinstance(attrs, TagAttrDict):  # pyright: ignore[reportUnnecessaryIsInstance]
+        out.append(attrs._get_html(minify))  # pyright: ignore[reportPrivateUsage]
+    else:
+        out.append(_attrs_html(attrs, minify))
+
+    all_children = x.children
+    if deps is not None:
+        if _needs_tagify(all_children):
+            all_children = _tagify_children(all_children)
+    # Dependencies are ignored in the HTML output
+    children = [c for c in all_children if not isinstance(c, MetadataNode)]
+    rest: Optional[Iterator[TagNode]] = None
+    if children and Lazy in map(type, children):
+        all_children, rest = _peek_lazy(all_children, deps is not None)
+        children = [c for c in all_children if not isinstance(c, MetadataNode)]
+
+    if deps is not None and (
+        len(children) == 0
+        or (len(children) == 1 and isinstance(children[0], (str, HTML)))
+    ):
+        # The children are written here rather than visited by _iter_html(), so
+        # collect their dependencies here too.
+        deps.extend(c for c in all_children if isinstance(c, HTMLDependency))
+
+    # Don't enclose JSX/void elements if there are no children
+    if len(children) == 0 and x.name in _VOID_TAG_NAMES:
+        out.append(">" if minify else "/>")
+        return
+
+    # Other empty tags are enclosed
+    close = "</" + x.name + ">"
+    if len(children) == 0:
+        out.append(">" + close)
+        return
+
+    collapse_ws = collapse_ws and x.name not in _PRESERVE_WS_TAG_NAMES
+
+    # Inline a single/empty child text node
+    if len(children) == 1 and isinstance(children[0], (str, HTML)):
+        if collapse_ws and isinstance(children[0], str) and children[0].isspace():
+            out.append("> " + close)
+        elif x.name in _NO_ESCAPE_TAG_NAMES:
+            child = children[0]
+            if not isinstance(child, HTML):
+                child = _TAG_CONTENT_ESCAPERS[x.name](child)
+            out.append(">" + str(child) + close)
+        else:
+            out.append(">" + _normalize_text(children[0]) + close)
+        return
 
-# Tags that have the form <tagname />
-_VOID_TAG_NAMES = {
-    "area",
-    "base",
-    "br",
-    "col",
-    "command",
-    "embed",
-    "hr",
-    "img",
-    "input",
-    "keygen",
-    "link",
-    "meta",
-    "param",
-    "source",
-    "track",
-    "wbr",
-}
+    # Write children
+    if x.add_ws:
+        out.append(">" + eol)
+        stack.append(eol + indent_str + close)
+    else:
+        out.append(">")
+        stack.append(close)
+
+    if deps is not None:
+        # Visit the dependencies along with the other children, so that they're
+        # collected in document order.
+        children = all_children
+
+    stack.append(
+        _HTMLFrame(
+            iter(children) if rest is None else chain(children, rest),
+            indent + 1,
+            eol,
+            _TAG_CONTENT_ESCAPERS.get(x.name, cached_escape_text),
+            x.add_ws and not minify,
+            minify,
+            collapse_ws,
+        )
+    )
 
-_NO_ESCAPE_TAG_NAMES = {"script", "style"}
+
+def _iter_html_chunks(
+    x: Tag | TagList, chunk_size: int, prefix: str = "", tagify: bool = False
+) -> Generator[str, None, None]:
+    # Yield the HTML for a Tag or TagList in chunks of roughly `chunk_size` characters.
+    # `x` must be tagified already, unless `tagify` is True, in which case it's tagified
+    # as it's walked (like render() does). Either way, the tree isn't walked until the
+    # first chunk is asked for.
+    if chunk_size < 1:
+        raise ValueError("`chunk_size` must be a positive integer.")
+
+    out: list[str] = [prefix] if prefix else []
+    deps: Optional[list[HTMLDependency]] = [] if tagify else None
+    yield from _iter_html(x, out, 0, "\n", chunk_size, deps=deps)
+    if out:
+        yield "".join(out)
+
+
+def _is_binary_stream(fp: _TextWriter | _BinaryWriter) -> bool:
+    if isinstance(fp, io.TextIOBase):
+        return False
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    # Other file-like objects, like tempfile.SpooledTemporaryFile
+    mode = getattr(fp, "mode", None)
+    return isinstance(mode, str) and "b" in mode
+
+
+def _write_chunks(
+    fp: _TextWriter | _BinaryWriter, chunks: Iterable[str], encoding: str = "utf-8"
+) -> None:
+    # Write chunks of HTML to a text or binary stream. For binary streams, each chunk
+    # is encoded as it is written, with a single encoder so that the output is the same
+    # as encoding all of the HTML at once (e.g., a UTF-16 BOM is only written once).
+    if _is_binary_stream(fp):
+        write_bytes = cast(_BinaryWriter, fp).write
+        encoder = codecs.getincrementalencoder(encoding)()
+        for chunk in chunks:
+            write_bytes(encoder.encode(chunk))
+        tail = encoder.encode("", final=True)
+        if tail:
+            write_bytes(tail)
+    else:
+        write_str = cast(_TextWriter, fp).write
+        for chunk in chunks:
+            write_str(chunk)
+
+
+async def _aiter_html_chunks(
+    chunks: Generator[str, None, None],
+) -> AsyncGenerator[str, None]:
+    # Each chunk is generated synchronously, but between chunks, other tasks get a
+    # chance to run. Since this is an async generator, the next chunk isn't generated
+    # until the consumer asks for it.
+    try:
+        for chunk in chunks:
+            yield chunk
+            await asyncio.sleep(0)
+    finally:
+        # If the consumer was cancelled or stopped early, stop walking the tree.
+        chunks.close()
 
 
 def _render_tag_or_taglist(x: Tag | TagList) -> str:
@@ -1083,7 +2810,11 @@ class HTMLDocument:
         self._content.append(*args)
 
     def render(
-        self, *, lib_prefix: Optional[str] = "lib", include_version: bool = True
+        self,
+        *,
+        lib_prefix: Optional[str] = "lib",
+        include_version: bool = True,
+        minify: bool = False,
     ) -> RenderedHTML:
         """
         Render the document.
@@ -1094,13 +2825,145 @@ class HTMLDocument:
             A prefix to add to relative paths to dependency files.
         include_version
             Whether to include the version number in the dependency's folder name.
+        minify
+            If True, write compact HTML. See :meth:`Tag.get_html_string`.
         """
 
         html_ = self._gen_html_tag_tree(lib_prefix, include_version=include_version)
-        rendered = html_.render()
-        rendered["html"] = "<!DOCTYPE html>\n" + rendered["html"]
+        rendered = html_.render(minify=minify)
+        rendered["html"] = (_DOCTYPE.rstrip() if minify else _DOCTYPE) + rendered[
+            "html"
+        ]
         return rendered
 
+    def iter_html(
+        self,
+        *,
+        lib_prefix: Optional[str] = "lib",
+        include_version: bool = True,
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[str]:
+        """
+        Iterate over the HTML for the document in chunks.
+
+        The HTML is generated while the tree is walked, so the complete string is never
+        held in memory. Joining the chunks gives the same result as
+        ``render()["html"]``.
+
+        Parameters
+        ----------
+        lib_prefix
+            A prefix to add to relative paths to dependency files.
+        include_version
+            Whether to include the version number in the dependency's folder name.
+        chunk_size
+            The approximate number of characters in each chunk. Chunks are split
+            between nodes, so a chunk may be larger than this if it contains a large
+            text node.
+
+        Returns
+        -------
+        :
+            An iterator over strings of HTML.
+        """
+        html_ = self._gen_html_tag_tree(lib_prefix, include_version=include_version)
+        return _iter_html_chunks(html_.tagify(), chunk_size, prefix=_DOCTYPE)
+
+    def aiter_html(
+        self,
+        *,
+        lib_prefix: Optional[str] = "lib",
+        include_version: bool = True,
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    ) -> AsyncGenerator[str, None]:
+        """
+        Asynchronously iterate over the HTML for the document in chunks.
+
+        This is the same as :meth:`iter_html`, except that control is given back to
+        the event loop after each chunk, so that rendering a large page doesn't block
+        other tasks. A chunk is only generated when the consumer asks for it, and
+        rendering stops if the consumer is cancelled or closes the iterator.
+
+        Parameters
+        ----------
+        lib_prefix
+            A prefix to add to relative paths to dependency files.
+        include_version
+            Whether to include the version number in the dependency's folder name.
+        chunk_size
+            The approximate number of characters in each chunk.
+
+        Returns
+        -------
+        :
+            An asynchronous iterator over strings of HTML.
+
+        Examples
+        --------
+        >>> async def app(scope, receive, send):
+        ...     await send({"type": "http.response.start", "status": 200})
+        ...     async for chunk in doc.aiter_html():
+        ...         body = chunk.encode()
+        ...         await send({"type": "http.response.body", "body": body, "more_body": True})
+        ...     await send({"type": "http.response.body", "body": b""})
+        """
+        return self._aiter_html(lib_prefix, include_version, chunk_size)
+
+    async def _aiter_html(
+        self, lib_prefix: Optional[str], include_version: bool, chunk_size: int
+    ) -> AsyncGenerator[str, None]:
+        # The dependencies have to be found before any HTML is written, since they go in
+        # the <head>. Other tasks get to run while the tree is tagified to find them.
+        html_ = await _arun_steps(
+            self._gen_html_tag_tree_steps(lib_prefix, include_version)
+        )
+        chunks = _iter_html_chunks(html_, chunk_size, prefix=_DOCTYPE, tagify=True)
+        achunks = _aiter_html_chunks(chunks)
+        try:
+            async for chunk in achunks:
+                yield chunk
+        finally:
+            await achunks.aclose()
+
+    def write_html(
+        self,
+        fp: _TextWriter | _BinaryWriter,
+        *,
+        lib_prefix: Optional[str] = "lib",
+        include_version: bool = True,
+        encoding: str = "utf-8",
+        chunk_size: int = _DEFAULT_CHUNK_SIZE,
+    ) -> None:
+        """
+        Write the document's HTML to a file-like object.
+
+        The HTML is written in chunks as it is generated, so the complete string is
+        never held in memory. Unlike :meth:`save_html`, this does not copy the files
+        for HTML dependencies.
+
+        Parameters
+        ----------
+        fp
+            A writable file-like object. It can be a text stream (like an open text
+            file or :class:`io.StringIO`) or a binary stream (like a file opened in
+            ``"wb"`` mode, :class:`io.BytesIO`, or :class:`gzip.GzipFile`).
+        lib_prefix
+            A prefix to add to relative paths to dependency files.
+        include_version
+            Whether to include the version number in the dependency's folder name.
+        encoding
+            The encoding to use when ``fp`` is a binary stream. Each chunk is encoded
+            as it is written. (Text streams do their own encoding.)
+        chunk_size
+            The approximate number of characters to write at a time.
+        """
+        chunks = self.iter_html(
+            lib_prefix=lib_prefix,
+            include_version=include_version,
+            chunk_size=chunk_size,
+        )
+        _write_chunks(fp, chunks, encoding)
+
     def save_html(
         self, file: str, libdir: Optional[str] = "lib", include_version: bool = True
     ) -> str:
@@ -1122,12 +2985,15 @@ class HTMLDocument:
         if libdir:
             destdir = os.path.join(destdir, libdir)
 
-        rendered = self.render(lib_prefix=libdir, include_version=include_version)
-        for dep in rendered["dependencies"]:
+        html_ = self._gen_html_tag_tree(libdir, include_version=include_version)
+        html_ = html_.tagify()
+        for dep in html_.get_dependencies():
             dep.copy_to(destdir, include_version=include_version)
 
+        # Write the HTML as it is generated, instead of holding the whole document in
+        # memory.
         with open(file, "w", encoding="utf-8") as f:
-            f.write(rendered["html"])
+            _write_chunks(f, _iter_html_chunks(html_, _DEFAULT_CHUNK_SIZE, _DOCTYPE))
         return file
 
     # Take the stored content, and generate an <html> tag which contains the correct
@@ -1138,6 +3004,11 @@ class HTMLDocument:
     def _gen_html_tag_tree(
         self, lib_prefix: Optional[str], include_version: bool
     ) -> Tag:
+        return _run_steps(self._gen_html_tag_tree_steps(lib_prefix, include_version))
+
+    def _gen_html_tag_tree_steps(
+        self, lib_prefix: Optional[str], include_version: bool
+    ) -> Generator[None, None, Tag]:
         content: TagList = self._content
         html: Tag
         body: Tag
@@ -1149,8 +3020,10 @@ class HTMLDocument:
         ):
             html = cast(Tag, content[0])
             html.attrs.update(**self._html_attr_args)
-            html = html.tagify()
-            html = HTMLDocument._hoist_head_content(html, lib_prefix, include_version)
+            html, deps = yield from _tagify_with_dependencies_steps(html)
+            html = HTMLDocument._hoist_head_content(
+                html, lib_prefix, include_version, deps
+            )
             return html
 
         if (
@@ -1162,18 +3035,22 @@ class HTMLDocument:
         else:
             body = Tag("body", content)
 
-        body = body.tagify()
+        body, deps = yield from _tagify_with_dependencies_steps(body)
 
         html = Tag("html", Tag("head"), body, _add_ws=True, **self._html_attr_args)
-        html = HTMLDocument._hoist_head_content(html, lib_prefix, include_version)
+        html = HTMLDocument._hoist_head_content(html, lib_prefix, include_version, deps)
         return html
 
     # Given an <html> tag object, copies the top node, then extracts dependencies from
     # the tree, and inserts the content from those dependencies into the <head>, such as
-    # <link> and <script> tags.
+    # <link> and <script> tags. If the (deduplicated) dependencies are already known,
+    # they can be passed in as `deps` to avoid walking the tree again.
     @staticmethod
     def _hoist_head_content(
-        x: Tag, lib_prefix: Optional[str], include_version: bool
+        x: Tag,
+        lib_prefix: Optional[str],
+        include_version: bool,
+        deps: Optional[list[HTMLDependency]] = None,
     ) -> Tag:
         if x.name != "html":
             raise ValueError(f"Expected <html> tag, got <{x.name}>.")
@@ -1201,7 +3078,8 @@ class HTMLDocument:
 
         # Add some metadata about the dependencies so that shiny.js' renderDependency
         # logic knows not to re-render them.
-        deps = x.get_dependencies()
+        if deps is None:
+            deps = x.get_dependencies()
         if len(deps) > 0:
             head.append(
                 Tag(
@@ -1287,6 +3165,56 @@ class HTMLTextDocument:
             Whether to include the version number in the dependency's folder name.
         """
 
+        html = self._html.replace(
+            cast(str, self._deps_replace_pattern),  # If we got here, we know it's a str
+            self._render_dep_tags(lib_prefix, include_version),
+            1,
+        )
+
+        return {"dependencies": deepcopy(self._deps), "html": html}
+
+    def write_html(
+        self,
+        fp: _TextWriter | _BinaryWriter,
+        *,
+        lib_prefix: Optional[str] = "lib",
+        include_version: bool = True,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Write the document's HTML to a file-like object.
+
+        The text of the document is written around the HTML for the dependencies, so
+        the complete document is never assembled into a single string.
+
+        Parameters
+        ----------
+        fp
+            A writable file-like object. It can be a text stream (like an open text
+            file or :class:`io.StringIO`) or a binary stream (like a file opened in
+            ``"wb"`` mode, :class:`io.BytesIO`, or :class:`gzip.GzipFile`).
+        lib_prefix
+            A prefix to add to relative paths to dependency files.
+        include_version
+            Whether to include the version number in the dependency's folder name.
+        encoding
+            The encoding to use when ``fp`` is a binary stream. (Text streams do their
+            own encoding.)
+        """
+        pattern = cast(str, self._deps_replace_pattern)
+        i = self._html.find(pattern)
+        if i == -1:
+            _write_chunks(fp, [self._html], encoding)
+            return
+
+        dep_html = self._render_dep_tags(lib_prefix, include_version)
+        _write_chunks(
+            fp,
+            [self._html[:i], dep_html, self._html[i + len(pattern) :]],
+            encoding,
+        )
+
+    def _render_dep_tags(self, lib_prefix: Optional[str], include_version: bool) -> str:
         dep_tags = TagList()
         # Add some metadata about the dependencies so that shiny.js' renderDependency
         # logic knows not to re-render them.
@@ -1306,15 +3234,7 @@ class HTMLTextDocument:
             ]
         )
 
-        rendered_dep_tags = dep_tags.render()
-
-        html = self._html.replace(
-            cast(str, self._deps_replace_pattern),  # If we got here, we know it's a str
-            rendered_dep_tags["html"],
-            1,
-        )
-
-        return {"dependencies": deepcopy(self._deps), "html": html}
+        return dep_tags.render()["html"]
 
     def _extract_serialized_html_deps(self) -> None:
         """
@@ -1888,9 +3808,9 @@ def consolidate_attrs(
 
     Convenience function to consolidate attributes and children into a single tuple. All
     `args` that are not dictionaries are considered children. This helps preserve the
-    non-attribute elements within `args`. To extract the attributes, all `args` and
-    `kwargs` are passed to `Tag` function and the attributes (`.attrs`) are extracted
-    from the resulting `Tag` object.
+    non-attribute elements within `args`. The attributes are merged in the same way as
+    the attributes of a `Tag` (see :class:`~htmltools.TagAttrDict`), but without making
+    a `Tag`, so the children are never looked at.
 
     Parameters
     ----------
@@ -1905,15 +3825,25 @@ def consolidate_attrs(
         A tuple of attributes and children. The attributes are a dictionary of combined
         named attributes, and the children are a list of unaltered child elements.
     """
-    tag = Tag("consolidate_attrs", *args, **kwargs)
-
-    # Convert to a plain dict to avoid getting custom methods from TagAttrDict
-    # Cast to `TagAttrs` as that is the common type used by py-shiny
-    attrs = cast(TagAttrs, dict(tag.attrs))
-
     # Do not alter/flatten children structure (like `TagList` does)
     # Instead, return all `args` who are not dictionaries
-    children = [child for child in args if not isinstance(child, dict)]
+    attr_args: list[Mapping[str, TagAttrValue]] = []
+    children: list[TagChildT] = []
+    for arg in args:
+        if isinstance(arg, dict):
+            attr_args.append(arg)
+        else:
+            children.append(arg)
+    if kwargs:
+        attr_args.append(kwargs)
+
+    # Merge into a plain dict to avoid getting custom methods from TagAttrDict
+    attrz: dict[str, str | HTML] = {}
+    TagAttrDict._merge_attrs(  # pyright: ignore[reportPrivateUsage]
+        attrz, tuple(attr_args)
+    )
+    # Cast to `TagAttrs` as that is the common type used by py-shiny
+    attrs = cast(TagAttrs, attrz)
     return (attrs, children)
 
 
@@ -1928,20 +3858,46 @@ def _tagchilds_to_tagnodes(x: Iterable[TagChild]) -> list[TagNode]:
     if isinstance(x, str):
         return [x]
 
-    result = flatten(x)
-    for i, item in enumerate(result):
-        if isinstance(item, (int, float)):
-            result[i] = str(item)
-        elif not is_tag_node(item):
-            raise TypeError(
-                f"Invalid tag item type: {type(item)}. "
-                + "Consider calling str() on this value before treating it as a tag item."
-            )
+    # Fast path for the most common case: a flat sequence of strings and tags (or no
+    # children at all), which needs no normalizing.
+    if isinstance(x, (tuple, list)):
+        for item in x:
+            if not isinstance(item, (str, Tag)):
+                break
+        else:
+            # Every item is a str or Tag, which are TagNodes.
+            return list(x)  # pyright: ignore[reportReturnType]
+
+    # Flatten nested lists, tuples, and TagLists, drop None, convert numbers to
+    # strings, and check the types of the rest, all in one walk with an explicit stack.
+    result: list[TagNode] = []
+    stack: list[Iterator[TagChild]] = [iter(x)]
+    while stack:
+        for item in stack[-1]:
+            # Strings and tags are checked first, since they're by far the most common,
+            # and checking them against TagList (an ABC) and the protocols is slower.
+            if isinstance(item, (str, Tag)):
+                result.append(item)
+            elif isinstance(item, (list, tuple, TagList)):
+                stack.append(iter(item))  # pyright: ignore[reportUnknownArgumentType]
+                break
+            elif item is None:
+                continue
+            elif isinstance(item, (int, float)):
+                result.append(str(item))
+            elif _node_kind(item):
+                result.append(item)  # pyright: ignore[reportArgumentType]
+            elif isinstance(item, Iterator):
+                result.append(Lazy(item))  # pyright: ignore[reportUnknownArgumentType]
+            else:
+                raise TypeError(
+                    f"Invalid tag item type: {type(item)}. "
+                    + "Consider calling str() on this value before treating it as a tag item."
+                )
+        else:
+            stack.pop()
 
-    # At this point, we know that all items in result must be valid TagNode
-    # objects, because None, int, float, and TagList objects have been removed. (Note
-    # that the TagList objects that have been flattened are TagList which are NOT tags.)
-    return cast("list[TagNode]", result)
+    return result
 
 
 def _tag_show(
@@ -1988,13 +3944,27 @@ def _normalize_text(txt: str | HTML) -> str:
     if isinstance(txt, HTML):
         return txt.as_string()
     else:
-        return html_escape(txt, attr=False)
+        return cached_escape_text(txt)
 
 
-def _equals_impl(x: Any, y: Any) -> bool:
+def _equals_impl(x: Any, y: Any, ignore: Iterable[str] = ()) -> bool:
     if not isinstance(y, type(x)):
         return False
-    for key in x.__dict__.keys():
+    for key in _field_names(x):
+        if key in ignore:
+            continue
         if getattr(x, key, None) != getattr(y, key, None):
             return False
     return True
+
+
+def _field_names(x: object) -> list[str]:
+    # The names of the instance fields of `x`, whether they're in slots or __dict__.
+    names = [
+        name
+        for cls in type(x).__mro__
+        for name in cls.__dict__.get("__slots__", ())
+        if name not in ("__dict__", "__weakref__") and hasattr(x, name)
+    ]
+    names.extend(getattr(x, "__dict__", ()))
+    return names
@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Callable, Iterable, Literal
+
+__all__ = (
+    "EscapeCache",
+    "EscapeContext",
+    "escape_text",
+    "escape_attr",
+    "escape_url_attr",
+    "escape_script",
+    "escape_style",
+    "escape_many",
+    "get_escaper",
+    "set_escape_cache",
+)
+
+EscapeContext = Literal["text", "attr", "url", "script", "style"]
+"""
+The places in an HTML document where a string can be written, each of which needs
+different escaping.
+"""
+
+# Each escaper first checks whether there is anything to escape at all, with `in` tests
+# (which are much faster than a regex search, and than str.translate(), for the short
+# strings that make up most of a page), and returns the string untouched if not.
+# Otherwise, it runs a fixed chain of str.replace() calls. The "&" replacement must come
+# first, so that the entities added by the others aren't escaped again.
+
+
+def escape_text(text: str) -> str:
+    """Escape a string to be written as the text of an element."""
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace(">", "&gt;").replace("<", "&lt;")
+    return text
+
+
+def escape_attr(text: str) -> str:
+    """Escape a string to be written as a (quoted) attribute value."""
+    if (
+        "&" in text
+        or "<" in text
+        or ">" in text
+        or '"' in text
+        or "'" in text
+        or "\r" in text
+        or "\n" in text
+    ):
+        return (
+            text.replace("&", "&amp;")
+            .replace(">", "&gt;")
+            .replace("<", "&lt;")
+            .replace('"', "&quot;")
+            .replace("'", "&apos;")
+            .replace("\r", "&#13;")
+            .replace("\n", "&#10;")
+        )
+    return text
+
+
+# ASCII control characters and spaces can't appear literally in a URL.
+_URL_UNSAFE = re.compile("[\x00-\x20\x7f]")
+
+
+def _percent_encode(m: re.Match[str]) -> str:
+    return f"%{ord(m.group()):02X}"
+
+
+def escape_url_attr(text: str) -> str:
+    """
+    Escape a URL to be written as a (quoted) attribute value, like ``href`` or ``src``.
+
+    In addition to the escaping done by :func:`escape_attr`, whitespace and control
+    characters are percent-encoded, since they aren't allowed in URLs.
+    """
+    # Spaces are by far the most common, and are replaced without a callback.
+    if " " in text:
+        text = text.replace(" ", "%20")
+    if _URL_UNSAFE.search(text) is not None:
+        text = _URL_UNSAFE.sub(_percent_encode, text)
+    return escape_attr(text)
+
+
+# Within <script> and <style>, text is not parsed as HTML, so it isn't entity-escaped.
+# The only thing that must be escaped is the start of a closing tag, which would end
+# the element early. It's escaped by putting a backslash before the "/", which doesn't
+# change the value of JavaScript and JSON strings, regular expressions, or CSS.
+_SCRIPT_UNSAFE = re.compile(r"</(script)", re.IGNORECASE)
+_STYLE_UNSAFE = re.compile(r"</(style)", re.IGNORECASE)
+
+
+def escape_script(text: str) -> str:
+    """Escape a string to be written as the contents of a ``<script>`` element."""
+    # Checking for "<" first is much faster than searching for "</" in strings that
+    # don't contain it.
+    if "<" in text and "</" in text:
+        return _SCRIPT_UNSAFE.sub(r"<\\/\1", text)
+    return text
+
+
+def escape_style(text: str) -> str:
+    """Escape a string to be written as the contents of a ``<style>`` element."""
+    if "<" in text and "</" in text:
+        return _STYLE_UNSAFE.sub(r"<\\/\1", text)
+    return text
+
+
+_ESCAPERS: dict[str, Callable[[str], str]] = {
+    "text": escape_text,
+    "attr": escape_attr,
+    "url": escape_url_attr,
+    "script": escape_script,
+    "style": escape_style,
+}
+
+
+def get_escaper(context: EscapeContext) -> Callable[[str], str]:
+    """Return the escaping function for a context."""
+    try:
+        return _ESCAPERS[context]
+    except KeyError:
+        raise ValueError(
+            f"Unknown escape context {context!r}; must be one of {list(_ESCAPERS)}"
+        ) from None
+
+
+# Joins the strings in a batch, so they can be escaped with one pass over a single large
+# string. It isn't changed by the text or attribute escapers, and is very unlikely to
+# appear in real text (if it does, each string is escaped separately).
+_BATCH_SEP = "\x00"
+
+
+def escape_many(
+    texts: Iterable[str], escaper: Callable[[str], str] = escape_text
+) -> list[str]:
+    """
+    Escape each of a collection of strings.
+
+    For the text and attribute escapers, the strings are joined, escaped at once, and
+    split again, which is much faster than escaping them one at a time when there are
+    many of them. Other escapers are called on each string.
+    """
+    texts = list(texts)
+    if escaper is not escape_text and escaper is not escape_attr:
+        return [escaper(x) for x in texts]
+    joined = _BATCH_SEP.join(texts)
+    escaped = escaper(joined)
+    if escaped is joined:
+        # Nothing to escape
+        return texts
+    if joined.count(_BATCH_SEP) != len(texts) - 1:
+        return [escaper(x) for x in texts]
+    return escaped.split(_BATCH_SEP)
+
+
+class EscapeCache:
+    """
+    A cache of escaped strings.
+
+    The same class names, ids, and labels often appear many times in a page. When an
+    escape cache is in use (see :func:`set_escape_cache`), the escaped versions of text
+    and attribute values written by ``.render()`` and ``get_html_string()`` are
+    remembered, so each distinct string is only escaped once. No cache is used by
+    default, since looking up strings that are rarely repeated is slower than just
+    escaping them.
+
+    Parameters
+    ----------
+    maxsize
+        The maximum number of strings to keep for each of text and attribute values.
+        When this is reached, the oldest entry is evicted.
+    max_length
+        Strings longer than this aren't cached. Long strings are rarely repeated, and
+        escaping them costs little compared to their size.
+
+    Attributes
+    ----------
+    hits
+        The number of times an escaped string was found in the cache.
+    misses
+        The number of times a string was escaped and added to the cache.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_length: int = 256) -> None:
+        if maxsize < 1:
+            raise ValueError("`maxsize` must be a positive integer.")
+        if max_length < 0:
+            raise ValueError("`max_length` must be a non-negative integer.")
+
+        self.maxsize = maxsize
+        self.max_length = max_length
+        self.hits = 0
+        self.misses = 0
+        self._text: OrderedDict[str, str] = OrderedDict()
+        self._attr: OrderedDict[str, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._text) + len(self._attr)
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of lookups which were found in the cache (0 if there were none).
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the cache, and reset the hit and miss counts.
+        """
+        self._text.clear()
+        self._attr.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # Entries are kept in insertion order rather than recency order, so that a hit costs
+    # only a lookup. (An OrderedDict is used because removing the first item of a plain
+    # dict over and over gets slower and slower.) These methods may be called from
+    # multiple threads without a lock: each dict operation is atomic, and the worst that
+    # can happen is that the counts are slightly off or an extra entry is evicted.
+
+    def escape_text(self, text: str) -> str:
+        """Like :func:`escape_text`, but cached."""
+        if len(text) > self.max_length:
+            return escape_text(text)
+        escaped = self._text.get(text)
+        if escaped is not None:
+            self.hits += 1
+            return escaped
+        escaped = escape_text(text)
+        self._store(self._text, text, escaped)
+        return escaped
+
+    def escape_attr(self, text: str) -> str:
+        """Like :func:`escape_attr`, but cached."""
+        if len(text) > self.max_length:
+            return escape_attr(text)
+        escaped = self._attr.get(text)
+        if escaped is not None:
+            self.hits += 1
+            return escaped
+        escaped = escape_attr(text)
+        self._store(self._attr, text, escaped)
+        return escaped
+
+    def _store(self, entries: OrderedDict[str, str], text: str, escaped: str) -> None:
+        self.misses += 1
+        if len(entries) >= self.maxsize:
+            try:
+                entries.popitem(last=False)
+            except KeyError:
+                # Another thread changed the dict at the same time.
+                pass
+        entries[text] = escaped
+
+
+_escape_cache: EscapeCache | None = None
+
+
+def set_escape_cache(cache: EscapeCache | None) -> EscapeCache | None:
+    """
+    Set the cache used when escaping text and attribute values.
+
+    Parameters
+    ----------
+    cache
+        An :class:`EscapeCache`, or ``None`` (the default) to stop caching.
+
+    Returns
+    -------
+    :
+        The previous cache (or ``None``), so that it can be restored.
+    """
+    global _escape_cache
+    old = _escape_cache
+    _escape_cache = cache
+    return old
+
+
+def cached_escape_text(text: str) -> str:
+    """Escape element text, using the current escape cache, if any."""
+    cache = _escape_cache
+    if cache is None:
+        return escape_text(text)
+    return cache.escape_text(text)
+
+
+def cached_escape_attr(text: str) -> str:
+    """Escape an attribute value, using the current escape cache, if any."""
+    cache = _escape_cache
+    if cache is None:
+        return escape_attr(text)
+    return cache.escape_attr(text)
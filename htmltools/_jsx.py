@@ -22,6 +22,7 @@ from ._core import (
     TagList,
     TagNode,
 )
+from ._util import normalize_attr_name
 from ._versions import versions
 
 # CPS 6/8/2022: this module is currently too experimental to be recommended for use.
@@ -62,11 +63,7 @@ class JSXTagAttrDict(Dict[str, JSXTagAttrValue]):
             attrs[self._normalize_attr_name(key)] = val
         super().update(**attrs)
 
-    @staticmethod
-    def _normalize_attr_name(x: str) -> str:
-        if x.endswith("_"):
-            x = x[:-1]
-        return x.replace("_", "-")
+    _normalize_attr_name = staticmethod(normalize_attr_name)
 
 
 class JSXTag:
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import re
+from copy import deepcopy
+from typing import Callable, Iterable, Mapping, Sequence, Union
+
+from ._core import HTML, HTMLDependency, MetadataNode, Tag, TagList
+from ._escape import cached_escape_attr, cached_escape_text, escape_script, escape_style
+
+__all__ = (
+    "Template",
+    "slot",
+)
+
+TemplateRecord = Union[Mapping[str, object], Sequence[object]]
+"""
+The values to fill a template's slots with: a mapping from slot names to values, or a
+sequence of values in the order of :attr:`Template.slots`.
+"""
+
+# A slot is written in a template as a marker string. NUL characters aren't changed by
+# escaping, and (unlike a "{name}" placeholder) don't appear in real text.
+_SLOT_MARKER = re.compile("\x00([A-Za-z_][A-Za-z0-9_]*)\x00")
+
+# When a template is compiled, each slot marker is replaced with one that also records
+# where the slot is, and so how its values are escaped. The space forces attribute
+# values with slots to be quoted, even when minifying.
+_CONTEXT_MARKER = re.compile("\x00(text|attr|script|style) ([A-Za-z0-9_]+)\x00")
+
+_SLOT_ESCAPERS: dict[str, Callable[[str], str]] = {
+    "text": cached_escape_text,
+    "attr": cached_escape_attr,
+    "script": escape_script,
+    "style": escape_style,
+}
+
+
+def slot(name: str) -> str:
+    """
+    A named hole in a :class:`Template`.
+
+    Use the result as the text of a tag, or as (part of) an attribute value, in the
+    content of a template.
+
+    Parameters
+    ----------
+    name
+        The name of the slot. Must be a valid Python identifier.
+
+    Returns
+    -------
+    :
+        A marker string which stands for the slot.
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Slot name {name!r} must be a valid Python identifier.")
+    return "\x00" + name + "\x00"
+
+
+class Template:
+    """
+    Tags which are rendered many times with different values.
+
+    The content of a template is rendered once, and split into static HTML and
+    :func:`slot`\\ s. Filling the template with a record only escapes the record's values
+    and joins them with the static HTML, so this is much faster than building the same
+    tags again for each record (as for a list of cards, menu items, or log lines).
+
+    Parameters
+    ----------
+    x
+        The content of the template. Slots may be used as the text of tags (including
+        ``<script>`` and ``<style>`` tags), and in attribute values, but not inside of
+        :class:`~htmltools.HTML`.
+    minify
+        Whether to write compact HTML. See :meth:`Tag.get_html_string`.
+
+    Attributes
+    ----------
+    slots
+        The names of the slots, in the order in which they first appear in the HTML
+        (where a tag's attributes come before its children). This is the order of the
+        values in records which are sequences.
+
+    Examples
+    --------
+    >>> from htmltools import Template, slot, div, a
+    >>> item = Template(div(a(slot("label"), href=slot("url")), class_="item"))
+    >>> item.slots
+    ('url', 'label')
+    >>> item.fill_many([{"label": "Home", "url": "/"}, ("/a?b=1&c=2", "A & B")])
+    <div class="item">
+      <a href="/">Home</a>
+    </div>
+    <div class="item">
+      <a href="/a?b=1&amp;c=2">A &amp; B</a>
+    </div>
+    """
+
+    def __init__(self, x: Tag | TagList, *, minify: bool = False) -> None:
+        x = deepcopy(x).tagify()
+        self._deps: list[HTMLDependency] = x.get_dependencies()
+        _mark_slot_contexts(x)
+
+        html_ = x.get_html_string(minify=minify)
+        leftover = _SLOT_MARKER.search(html_)
+        if leftover is not None:
+            raise ValueError(
+                f"Slot {leftover.group(1)!r} is in a place where it can't be filled. "
+                "Slots can only be used in the text of tags and in attribute values."
+            )
+
+        # re.split() with two groups gives [static, context, name, static, ...]
+        parts = _CONTEXT_MARKER.split(html_)
+        self._first = parts[0]
+        self._sep = "" if minify else _record_sep(x)
+        slots: list[str] = []
+        # For each slot in the HTML: its position in a sequence record, how to escape its
+        # values, and the static HTML which follows it.
+        self._holes: list[tuple[int, Callable[[str], str], str]] = []
+        for i in range(1, len(parts), 3):
+            context, name, static = parts[i], parts[i + 1], parts[i + 2]
+            if name not in slots:
+                slots.append(name)
+            self._holes.append((slots.index(name), _SLOT_ESCAPERS[context], static))
+        self.slots: tuple[str, ...] = tuple(slots)
+
+    def fill(self, record: TemplateRecord) -> TagList:
+        """
+        Fill the template's slots with the values of a record.
+
+        Parameters
+        ----------
+        record
+            A mapping from slot names to values, or a sequence of values in the order of
+            :attr:`slots`. String values are escaped; :class:`~htmltools.HTML` values
+            are written as-is; ``None`` is written as an empty string; and other values
+            are converted with ``str()``.
+
+        Returns
+        -------
+        :
+            A :class:`~htmltools.TagList` with the HTML, and any HTML dependencies in the
+            template.
+        """
+        return self.fill_many((record,))
+
+    def fill_many(self, records: Iterable[TemplateRecord]) -> TagList:
+        """
+        Fill the template once for each of a collection of records.
+
+        Parameters
+        ----------
+        records
+            The records to fill the template with. See :meth:`fill`.
+
+        Returns
+        -------
+        :
+            A :class:`~htmltools.TagList` with the HTML for all of the records, one after
+            the other (with the same whitespace between them as a
+            :class:`~htmltools.TagList` of the filled content would have), and any HTML
+            dependencies in the template.
+        """
+        out: list[str] = []
+        first = self._first
+        sep = self._sep
+        holes = self._holes
+        n_slots = len(self.slots)
+        for record in records:
+            if isinstance(record, Mapping):
+                values = [record[name] for name in self.slots]
+            elif isinstance(record, (str, bytes)):
+                # These are sequences, but a string is almost certainly a mistake, like
+                # passing a single record to fill_many().
+                raise TypeError(
+                    "Each record must be a mapping or a sequence of values, not "
+                    f"{type(record).__name__}."
+                )
+            else:
+                values = record
+                if len(values) != n_slots:
+                    raise ValueError(
+                        f"Expected {n_slots} values for slots {self.slots}, "
+                        f"got {len(values)}."
+                    )
+            if out:
+                out.append(sep)
+            out.append(first)
+            for i, escape, static in holes:
+                val = values[i]
+                if isinstance(val, str):
+                    out.append(escape(val))
+                elif isinstance(val, HTML):
+                    out.append(val.as_string())
+                elif val is not None:
+                    out.append(escape(str(val)))
+                out.append(static)
+        return TagList(HTML("".join(out)), *self._deps)
+
+
+def _record_sep(x: Tag | TagList) -> str:
+    # The separator between filled records, which is the same as a TagList would write
+    # between them: a line break if the last node of a record or the first node of the
+    # next one is a tag with add_ws, and nothing otherwise.
+    if isinstance(x, Tag):
+        nodes = [x]
+    else:
+        nodes = [child for child in x if not isinstance(child, MetadataNode)]
+    if not nodes:
+        return ""
+    first, last = nodes[0], nodes[-1]
+    if (isinstance(first, Tag) and first.add_ws) or (
+        isinstance(last, Tag) and last.add_ws
+    ):
+        return "\n"
+    return ""
+
+
+def _mark_slot_contexts(x: Tag | TagList) -> None:
+    # Replace the slot markers in the text and attribute values of a tagified tree with
+    # ones that record which context they're in.
+    stack: list[tuple[str, TagList]] = []
+    if isinstance(x, Tag):
+        stack.append(_mark_tag(x))
+    else:
+        stack.append(("text", x))
+
+    while stack:
+        context, children = stack.pop()
+        for i, child in enumerate(children):
+            if isinstance(child, Tag):
+                stack.append(_mark_tag(child))
+            elif isinstance(child, TagList):
+                stack.append((context, child))
+            elif isinstance(child, str) and "\x00" in child:
+                children[i] = _SLOT_MARKER.sub(f"\x00{context} \\1\x00", child)
+
+
+def _mark_tag(x: Tag) -> tuple[str, TagList]:
+    for key, val in x.attrs.items():
+        if isinstance(val, str) and "\x00" in val:
+            x.attrs[key] = _SLOT_MARKER.sub("\x00attr \\1\x00", val)
+    context = x.name if x.name in ("script", "style") else "text"
+    return context, x.children
@@ -4,27 +4,55 @@ import hashlib
 import importlib
 import os
 import re
+import sys
 import tempfile
 from contextlib import closing
 from http.server import SimpleHTTPRequestHandler
 from socket import socket
 from socketserver import TCPServer
 from threading import Thread
-from typing import Any, Hashable, Iterable, NamedTuple, Optional, TypeVar, Union
+from typing import (
+    Any,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+)
+
+from ._escape import (
+    EscapeContext,
+    cached_escape_attr,
+    cached_escape_text,
+    escape_attr,
+    escape_many,
+    escape_text,
+    get_escaper,
+)
 
 T = TypeVar("T")
 
 HashableT = TypeVar("HashableT", bound=Hashable)
 
 __all__ = (
+    "Style",
     "css",
     "html_escape",
+    "html_escape_many",
 )
 
 
+# The values of CSS properties for css() and Style: a list of strings is joined with
+# spaces, and None leaves the property out.
+CssValue = Union[str, float, "list[str]", None]
+
+
 def css(
-    collapse_: str | float | None = "",
-    **kwargs: str | float | None,
+    collapse_: CssValue = "",
+    **kwargs: CssValue,
 ) -> Optional[str]:
     """
     CSS string helper
@@ -66,38 +94,116 @@ def css(
     if not isinstance(collapse_, str):
         raise TypeError("`collapse_` must be of type `str`")
 
-    res = ""
-    for k, v in kwargs.items():
+    decls = _css_declarations({}, kwargs)
+    if not decls:
+        return None
+    return collapse_.join(decls.values()) + collapse_
+
+
+class Style:
+    """
+    CSS style declarations
+
+    Like :func:`css`, but the declarations are kept separate, so that they can be added
+    to a tag's style attribute (with :meth:`~htmltools.Tag.add_style`) without parsing
+    them, and so that declarations of the same property replace each other.
+
+    Parameters
+    ----------
+    props
+        A mapping from property names to values.
+    **kwargs
+        More properties.
+
+    Note
+    ----
+    Property names are converted like they are by :func:`css`. Values which are
+    ``None`` are skipped, and lists are joined with spaces. A later value for the same
+    property replaces an earlier one.
+
+    Example
+    -------
+    >>> from htmltools import Style, div
+    >>> style = Style({"font_size": "12px"}, backgroundColor="red", font_size="14px")
+    >>> str(style)
+    'background-color:red;font-size:14px;'
+    >>> div().add_style(style)
+    <div style="background-color:red;font-size:14px;"></div>
+    """
+
+    __slots__ = ("_decls",)
+
+    def __init__(
+        self, props: Mapping[str, CssValue] | None = None, /, **kwargs: CssValue
+    ) -> None:
+        self._decls: dict[str, str] = {}
+        if props:
+            _css_declarations(self._decls, props)
+        if kwargs:
+            _css_declarations(self._decls, kwargs)
+
+    def __str__(self) -> str:
+        return "".join(self._decls.values())
+
+    def __repr__(self) -> str:
+        return f"Style({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        # The order of declarations matters, so they're compared as strings.
+        return isinstance(other, Style) and str(self) == str(other)
+
+    def __len__(self) -> int:
+        return len(self._decls)
+
+
+# CSS property names, keyed by the keyword argument names they came from.
+_css_names: dict[str, str] = {}
+
+
+def _css_declarations(
+    decls: dict[str, str], props: Mapping[str, CssValue]
+) -> dict[str, str]:
+    # Add a "property:value;" declaration for each property to `decls`, keyed by the
+    # property name. Property names are converted from snake_case and camelCase to
+    # kebab-case; since the same few names are used over and over, the results are
+    # cached. A property which is declared again is moved to the end, since the
+    # declarations in between might be shorthands which set it.
+    for k, v in props.items():
         if v is None:
             continue
-        v = " ".join(v) if isinstance(v, list) else str(v)
-        k = re.sub("_", "-", re.sub("([A-Z])", "-\\1", k).lower())
-        res += k + ":" + v + ";" + collapse_
-    return None if res == "" else res
+        name = _css_names.get(k)
+        if name is None:
+            name = re.sub("_", "-", re.sub("([A-Z])", "-\\1", k).lower())
+            if len(_css_names) >= 4096:
+                _css_names.clear()
+            _css_names[k] = name
+        if not isinstance(v, str):
+            v = " ".join(v) if isinstance(v, list) else str(v)
+        if name in decls:
+            del decls[name]
+        decls[name] = name + ":" + v + ";"
+    return decls
 
 
 # Flatten a arbitrarily nested list and remove None. Does not alter input object.
 def flatten(x: Iterable[Union[T, None]]) -> list[T]:
-    result: list[T] = []
-    _flatten_recurse(x, result)
-    return result
-
-
-# Having this separate function and passing along `result` is faster than defining
-# a closure inside of `flatten()` (and not passing `result`).
-def _flatten_recurse(x: Iterable[T | None], result: list[T]) -> None:
+    # Imported here to avoid a circular import
     from ._core import TagList
 
-    for item in x:
-        if isinstance(item, (list, tuple, TagList)):
-            # Don't yet know how to specify recursive generic types, so we'll tell
-            # the type checker to ignore this line.
-            _flatten_recurse(
-                item,  # pyright: ignore[reportUnknownArgumentType]
-                result,  # pyright: ignore[reportArgumentType]
-            )
-        elif item is not None:
-            result.append(item)
+    # Nested lists are walked with an explicit stack instead of recursion, so that only
+    # one function call is needed no matter how deeply they're nested.
+    result: list[T] = []
+    stack: list[Iterator[Any]] = [iter(x)]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, (list, tuple, TagList)):
+                stack.append(iter(item))  # pyright: ignore[reportUnknownArgumentType]
+                break
+            if item is not None:
+                result.append(item)
+        else:
+            stack.pop()
+    return result
 
 
 # similar to unique() in R (set() doesn't preserve order)
@@ -107,6 +213,27 @@ def unique(x: list[HashableT]) -> list[HashableT]:
     return list(dict.fromkeys(x))
 
 
+# Normalized attribute names, keyed by the keyword argument names they came from.
+_attr_names: dict[str, str] = {}
+
+
+# Convert a keyword argument name to an attribute name, e.g., class_ -> class and
+# foo_Bar_ -> foo-Bar. The same few names are used for every tag, so the results are
+# cached (and interned, so that each name is stored once and compares quickly).
+def normalize_attr_name(x: str) -> str:
+    nm = _attr_names.get(x)
+    if nm is None:
+        nm = x[:-1] if x.endswith("_") else x
+        nm = sys.intern(nm.replace("_", "-"))
+        if len(_attr_names) >= 4096:
+            # Don't grow without bound if names are generated on the fly.
+            _attr_names.clear()
+        _attr_names[x] = nm
+    return nm
+
+
+# These tables are no longer used by html_escape() (see _escape.py), but are kept for
+# backwards compatibility.
 HTML_ESCAPE_TABLE = {
     "&": "&amp;",
     ">": "&gt;",
@@ -122,13 +249,67 @@ HTML_ATTRS_ESCAPE_TABLE = {
 }
 
 
-def html_escape(text: str, attr: bool = False) -> str:
-    table = HTML_ATTRS_ESCAPE_TABLE if attr else HTML_ESCAPE_TABLE
-    if not re.search("|".join(table), text):
-        return text
-    for key, value in table.items():
-        text = text.replace(key, value)
-    return text
+def html_escape(
+    text: str, attr: bool = False, *, context: Optional[EscapeContext] = None
+) -> str:
+    """
+    Escape a string for use in HTML.
+
+    Parameters
+    ----------
+    text
+        The string to escape.
+    attr
+        Whether the string is an attribute value, rather than the text of an element.
+        Ignored if ``context`` is given.
+    context
+        Where the string will be written: ``"text"`` (the text of an element),
+        ``"attr"`` (a quoted attribute value), ``"url"`` (a quoted attribute value
+        that's a URL, like ``href``; whitespace and control characters are also
+        percent-encoded), ``"script"`` or ``"style"`` (the contents of a ``<script>``
+        or ``<style>`` element; only sequences that would end the element are
+        escaped).
+
+    Returns
+    -------
+    :
+        The escaped string. If there is nothing to escape, this is ``text`` itself.
+    """
+    if context is not None:
+        return get_escaper(context)(text)
+    return cached_escape_attr(text) if attr else cached_escape_text(text)
+
+
+def html_escape_many(
+    texts: Iterable[str], attr: bool = False, *, context: Optional[EscapeContext] = None
+) -> list[str]:
+    """
+    Escape a collection of strings for use in HTML.
+
+    This gives the same results as calling :func:`html_escape` on each string, but is
+    much faster for large collections (like the cells of a table), since text and
+    attribute values are escaped all at once.
+
+    Parameters
+    ----------
+    texts
+        The strings to escape.
+    attr
+        Whether the strings are attribute values, rather than the text of elements.
+        Ignored if ``context`` is given.
+    context
+        Where the strings will be written. See :func:`html_escape` for details.
+
+    Returns
+    -------
+    :
+        A list of the escaped strings, in the same order as ``texts``.
+    """
+    if context is not None:
+        escaper = get_escaper(context)
+    else:
+        escaper = escape_attr if attr else escape_text
+    return escape_many(texts, escaper)
 
 
 # Backwards compatibility with faicons 0.2.1
@@ -1,4 +1,4 @@
-from htmltools import HTML, consolidate_attrs
+from htmltools import HTML, consolidate_attrs, div
 
 
 def test_consolidate_attrs():
@@ -16,3 +16,13 @@ def test_consolidate_attrs():
 
     assert attrs == {"id": "foo", "class": "&amp;c1 &c2 &c3", "other-attr": "other"}
     assert children == [0, [1, [2]], 3]
+
+    # The attributes are a plain dict, and the children aren't looked at (or consumed)
+    assert type(attrs) is dict
+    gen = (x for x in ["a"])
+    attrs, children = consolidate_attrs(gen, div("b"), {"x_y": 1}, z=True)
+    assert attrs == {"x-y": "1", "z": ""}
+    assert children == [gen, div("b")]
+    assert list(gen) == ["a"]
+
+    assert consolidate_attrs() == ({}, [])
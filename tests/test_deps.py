@@ -1,3 +1,4 @@
+import json
 import tempfile
 import textwrap
 from pathlib import Path
@@ -177,6 +178,21 @@ def test_head_output():
     )
 
 
+def test_script_json_round_trip():
+    # The JSON in the <script> tag parses back to the same values, even when they
+    # contain sequences that have to be escaped inside of a <script>.
+    head = "<!-- hi --><script>if (a </script>"
+    dep = HTMLDependency("a", "1.0", source={"subdir": "foo"}, head=head)
+    for x in (
+        dep.serialize_to_script_json(),
+        tags.script(json.dumps({"head": head})),
+    ):
+        html = x.get_html_string()
+        assert html.count("</script>") == 1
+        data = json.loads(html[html.index(">") + 1 : -len("</script>")])
+        assert data["head"] == head
+
+
 def test_meta_output():
     a = HTMLDependency(
         "a",
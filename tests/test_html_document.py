@@ -1,3 +1,5 @@
+import asyncio
+import io
 import os
 import textwrap
 from tempfile import TemporaryDirectory
@@ -7,6 +9,7 @@ import htmltools as ht
 from htmltools import (
     HTMLDependency,
     HTMLDocument,
+    HTMLTextDocument,
     Tag,
     TagList,
     div,
@@ -179,6 +182,58 @@ def test_html_document_head_hoisting():
     assert doc.render()["html"] == saved_html(doc)
 
 
+def test_html_document_iter_html():
+    testdep = HTMLDependency(
+        "testdep",
+        "1.0",
+        source={"package": "htmltools", "subdir": "libtest/testdep"},
+        script={"src": "testdep.js"},
+    )
+    doc = HTMLDocument(div("Hello", testdep, [span(str(i)) for i in range(20)]))
+
+    chunks = list(doc.iter_html(chunk_size=64))
+    assert len(chunks) > 1
+    assert chunks[0].startswith("<!DOCTYPE html>\n<html>")
+    assert "".join(chunks) == doc.render()["html"]
+    assert "".join(doc.iter_html(lib_prefix=None)) == (
+        doc.render(lib_prefix=None)["html"]
+    )
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in doc.aiter_html(chunk_size=64)]
+
+    assert asyncio.run(collect()) == chunks
+
+
+def test_html_document_write_html():
+    doc = HTMLDocument(div("caf\u00e9", head_content(tags.title("T"))), lang="en")
+    expected = doc.render()["html"]
+
+    text = io.StringIO()
+    doc.write_html(text)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    doc.write_html(binary, chunk_size=10)
+    assert binary.getvalue() == expected.encode("utf-8")
+
+    dep = HTMLDependency("foo", "1.0", script={"src": "foo.js"})
+    text_doc = HTMLTextDocument(
+        '<html><head><meta data-foo=""></head><body>\u00e9</body></html>',
+        deps=[dep],
+        deps_replace_pattern='<meta data-foo="">',
+    )
+    binary = io.BytesIO()
+    text_doc.write_html(binary, lib_prefix=None)
+    assert binary.getvalue() == (
+        text_doc.render(lib_prefix=None)["html"].encode("utf-8")
+    )
+
+    text = io.StringIO()
+    text_doc.write_html(text)
+    assert text.getvalue() == text_doc.render()["html"]
+
+
 def test_tagify_first():
     # A Tagifiable object which returns a Tag with an HTMLDependency when `tagify()` is
     # called.
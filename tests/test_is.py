@@ -5,6 +5,7 @@ import pytest
 from htmltools import (
     HTML,
     HTMLDependency,
+    Lazy,
     ReprHtml,
     Tag,
     TagAttrs,
@@ -49,6 +50,7 @@ tag_node_objs: List[TagNode] = [
     repr_obj,
     "test_string",
     HTML("test_html"),
+    Lazy([div("div_content")]),
 ]
 tag_child_only_objs: List[TagChild] = [
     # *tag_node_objs,
@@ -56,6 +58,7 @@ tag_child_only_objs: List[TagChild] = [
     [Tag("test_element3")],
     None,
     [],
+    iter([div("div_content")]),
 ]
 
 not_tag_child_objs = [
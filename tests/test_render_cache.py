@@ -0,0 +1,145 @@
+import sys
+from typing import Iterator
+
+import pytest
+
+from htmltools import (
+    HTML,
+    HTMLDependency,
+    HTMLDocument,
+    RenderCache,
+    Tag,
+    TagChild,
+    TagList,
+    div,
+    set_render_cache,
+    span,
+    tags,
+)
+
+
+@pytest.fixture
+def cache() -> Iterator[RenderCache]:
+    cache = RenderCache(maxsize=100)
+    old = set_render_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_render_cache(old)
+
+
+def card(title: str, *args: TagChild) -> Tag:
+    return div(
+        div(tags.b(title), class_="card-header"),
+        div("Some <text>", HTML("<i>raw</i>"), *args, class_="card-body"),
+        class_="card",
+    )
+
+
+def test_render_cache_output(cache: RenderCache):
+    dep = HTMLDependency("a", "1.0")
+    x = TagList(card("one"), card("two", dep), div(card("one"), card("two", dep)))
+
+    set_render_cache(None)
+    expected = x.render()
+    doc_expected = HTMLDocument(x).render()
+    set_render_cache(cache)
+
+    assert x.render() == expected
+    # Rendering again, with an identical tree, is served from the cache
+    hits = cache.hits
+    x2 = TagList(card("one"), card("two", dep), div(card("one"), card("two", dep)))
+    assert x2.render() == expected
+    assert cache.hits > hits
+    assert HTMLDocument(x2).render() == doc_expected
+
+    # Dependencies are matched by value, not identity
+    x3 = card("two", HTMLDependency("a", "1.0"))
+    assert x3.render()["dependencies"] == [dep]
+    assert card("two", HTMLDependency("a", "2.0")).render()["dependencies"] == [
+        HTMLDependency("a", "2.0")
+    ]
+
+
+def test_render_cache_keys(cache: RenderCache):
+    # Anything that affects the output is part of the key
+    variants = [
+        div("a"),
+        div(HTML("a")),
+        div("a", id="x"),
+        div("a", id=HTML("x")),
+        div("a", _add_ws=False),
+        span("a"),
+        div(div("a")),
+        div(div("a"), "b"),
+        div(div(div("a"), "b")),
+        tags.script("a<"),
+        tags.b("a<"),
+    ]
+    for _ in range(2):
+        for x in variants:
+            for wrap in (lambda x: x, lambda x: div(x), lambda x: span("a", x)):
+                set_render_cache(None)
+                expected = wrap(x).render()
+                expected_minified = wrap(x).render(minify=True)
+                set_render_cache(cache)
+                assert wrap(x).render() == expected
+                assert wrap(x).render(minify=True) == expected_minified
+
+
+def test_render_cache_uncacheable(cache: RenderCache):
+    n = 0
+
+    class Counter:
+        def tagify(self) -> Tag:
+            nonlocal n
+            n += 1
+            return span(str(n))
+
+    # Tags containing Tagifiable objects aren't cached, but the tags inside of them
+    # can be.
+    x = div(div("static"), Counter())
+    assert str(x) == "<div>\n  <div>static</div>\n  <span>1</span>\n</div>"
+    assert str(x) == "<div>\n  <div>static</div>\n  <span>2</span>\n</div>"
+    assert cache.hits == 1
+
+
+def test_render_cache_eviction():
+    lru = RenderCache(maxsize=2)
+    fifo = RenderCache(maxsize=2, policy="fifo")
+    for cache in (lru, fifo):
+        old = set_render_cache(cache)
+        try:
+            for x in ("a", "b", "a", "c", "a"):
+                div(x).render()
+        finally:
+            set_render_cache(old)
+        assert len(cache) == 2
+
+    # With LRU, "a" was used recently, so "b" was evicted when "c" was added.
+    assert (lru.hits, lru.misses) == (2, 3)
+    # With FIFO, "a" was evicted when "c" was added.
+    assert (fifo.hits, fifo.misses) == (1, 4)
+
+    lru.clear()
+    assert len(lru) == 0
+    assert (lru.hits, lru.misses) == (0, 0)
+
+    with pytest.raises(ValueError):
+        RenderCache(maxsize=0)
+    with pytest.raises(ValueError):
+        RenderCache(policy="random")  # type: ignore
+
+
+def test_render_cache_deep_tree(cache: RenderCache):
+    # The keys of nested tags are built, hashed, and compared without recursion.
+    def nested() -> Tag:
+        x = span("leaf")
+        for _ in range(sys.getrecursionlimit() + 100):
+            x = span(x, _add_ws=False)
+        return x
+
+    html = nested().render()["html"]
+    hits = cache.hits
+    assert nested().render()["html"] == html
+    assert cache.hits == hits + 1
@@ -1,5 +1,9 @@
+import asyncio
 import copy
+import gzip
+import io
 import os
+import sys
 import textwrap
 from tempfile import TemporaryDirectory
 from typing import Any, Callable, Union, cast
@@ -10,8 +14,10 @@ from htmltools import (
     HTML,
     HTMLDependency,
     HTMLDocument,
+    Lazy,
     MetadataNode,
     Tag,
+    TagChild,
     TagFunction,
     TagList,
     TagNode,
@@ -21,6 +27,7 @@ from htmltools import (
     h2,
     head_content,
     span,
+    table_from_columns,
     tags,
 )
 
@@ -162,6 +169,80 @@ def test_tag_attrs_update():
     assert x.attrs == {"a": "1", "b": "2", "c": "C"}
 
 
+def test_tag_attrs_html_cache():
+    # The HTML for a tag's attributes is cached until the attributes change.
+    x = div(id="a", class_="b")
+    assert str(x) == '<div id="a" class="b"></div>'
+    assert x.get_html_string(minify=True) == "<div id=a class=b></div>"
+    assert x.attrs._html == ' id="a" class="b"'  # pyright: ignore[reportPrivateUsage]
+
+    x.attrs["id"] = "c"
+    assert str(x) == '<div id="c" class="b"></div>'
+    x.add_class("d")
+    assert str(x) == '<div id="c" class="b d"></div>'
+    assert x.get_html_string(minify=True) == '<div id=c class="b d"></div>'
+    x.remove_class("b")
+    assert str(x) == '<div id="c" class="d"></div>'
+    x.add_style("color:red;")
+    assert str(x) == '<div id="c" class="d" style="color:red;"></div>'
+    x.attrs.update(title="t")
+    assert str(x) == '<div id="c" class="d" style="color:red;" title="t"></div>'
+    x.attrs.pop("style")
+    del x.attrs["title"]
+    assert str(x) == '<div id="c" class="d"></div>'
+    x.attrs.setdefault("lang", "en")
+    assert str(x) == '<div id="c" class="d" lang="en"></div>'
+    x.attrs |= {"dir": "ltr"}
+    assert str(x) == '<div id="c" class="d" lang="en" dir="ltr"></div>'
+    x.attrs.popitem()
+    assert str(x) == '<div id="c" class="d" lang="en"></div>'
+    x.attrs.clear()
+    assert str(x) == "<div></div>"
+
+    # Copies keep the cached HTML, but don't share changes
+    x = div(id="a")
+    str(x)
+    y = copy.copy(x)
+    assert y.attrs is not x.attrs and str(y) == str(x)
+    y.attrs["id"] = "b"
+    assert str(x) == '<div id="a"></div>'
+    assert str(y) == '<div id="b"></div>'
+    assert str(copy.deepcopy(x)) == '<div id="a"></div>'
+
+
+def test_tag_class_set():
+    # Classes are kept as an ordered set
+    x = div(class_="a b")
+    x.add_class("b c").add_class("c a d").add_class("e a", prepend=True)
+    assert x.attrs["class"] == "e a b c d"
+    assert x.has_class("d") and not x.has_class("f") and not x.has_class("c d")
+    x.remove_class("a").remove_class("f")
+    assert x.attrs["class"] == "e b c d"
+
+    # Changing the attribute directly is noticed
+    x.attrs["class"] = "x y"
+    assert not x.has_class("e") and x.has_class("y")
+    x.add_class("z")
+    assert str(x) == '<div class="x y z"></div>'
+    del x.attrs["class"]
+    assert not x.has_class("x")
+    x.add_class("x")
+    assert x.attrs["class"] == "x"
+
+    # Copies don't share classes
+    y = copy.copy(x)
+    y.add_class("y")
+    x.remove_class("x")
+    assert "class" not in x.attrs and y.attrs["class"] == "x y"
+
+    # Strings with no class names are joined as before
+    assert str(div().add_class("")) == '<div class=""></div>'
+    assert str(div(class_="a").add_class("")) == '<div class="a "></div>'
+    assert (
+        str(div(class_="a").add_class(" ", prepend=True)) == '<div class="  a"></div>'
+    )
+
+
 def test_tag_multiple_repeated_attrs():
     foo_attrs = div({"class": "foo"}).attrs
     bar_attrs = div({"class": "bar"}).attrs
@@ -249,32 +330,132 @@ def test_tag_shallow_copy():
     assert x.children[2] is y.children[2]
 
 
-def test_tagify_deep_copy():
-    # Each call to .tagify() should do a shallow copy, but since it recurses, the result
-    # is a deep copy.
+def test_tag_slots():
+    # Plain Tags store their fields in slots, to save memory.
+    x = div(span("a"), id="x")
+    assert not hasattr(x, "__dict__")
+    with pytest.raises(AttributeError):
+        x.foo = "bar"  # type: ignore[attr-defined]
+
+    # Subclasses can still have other fields, which are copied and compared.
+    class MyTag(Tag):
+        def __init__(self, *args: TagChild, extra: str) -> None:
+            super().__init__("my-tag", *args)
+            self.extra = [extra]
+
+    y = MyTag(span("a"), extra="one")
+    y_copy = copy.copy(y)
+    assert y_copy == y
+    assert y_copy.name == "my-tag" and y_copy.children == y.children
+    assert y_copy.extra is not y.extra
+    y_copy.extra.append("two")
+    assert y_copy != y
+    assert MyTag(extra="one") != MyTag(extra="two")
+    assert div("a") != div("b")
+
+
+def test_tagify_copy_on_write():
+    # .tagify() copies each tag that has something to tagify beneath it, but tags with
+    # nothing to tagify beneath them are shared with the original.
     dep = HTMLDependency(
         "a", "1.1", source={"package": None, "subdir": "foo"}, script={"src": "a1.js"}
     )
-    x = div(tags.i("hello", prop="value"), "world", dep, class_="myclass")
+    x = div(
+        tags.i("hello", prop="value"),
+        "world",
+        dep,
+        span(span("a"), head_content("b")),
+        class_="myclass",
+    )
 
     y = x.tagify()
-    cast_tag(y.children[0]).children[0] = "HELLO"
-    cast_tag(y.children[0]).attrs["prop"] = "VALUE"
+    assert y is not x
+    assert y.children is not x.children
+    # The <i> tag has nothing to tagify, so it is shared
+    assert y.children[0] is x.children[0]
+    # The dependency and the path to the head_content() are copied
+    assert y.children[2] is not x.children[2]
+    assert y.children[3] is not x.children[3]
+    assert cast_tag(y.children[3]).children[0] is cast_tag(x.children[3]).children[0]
+    assert cast_tag(y.children[3]).children[1] is not (
+        cast_tag(x.children[3]).children[1]
+    )
+
     y.children[1] = "WORLD"
     y.attrs["class"] = "MYCLASS"
     cast(HTMLDependency, y.children[2]).name = "A"
 
     assert x.attrs == {"class": "myclass"}
     assert y.attrs == {"class": "MYCLASS"}
-    assert cast_tag(x.children[0]).attrs == {"prop": "value"}
-    assert cast_tag(y.children[0]).attrs == {"prop": "VALUE"}
-    assert cast_tag(x.children[0]).children[0] == "hello"
-    assert cast_tag(y.children[0]).children[0] == "HELLO"
     assert x.children[1] == "world"
     assert y.children[1] == "WORLD"
     assert cast(HTMLDependency, x.children[2]).name == "a"
     assert cast(HTMLDependency, y.children[2]).name == "A"
-    assert x.children[2] is not y.children[2]
+
+    # A tree with nothing to tagify only has its top level copied
+    z = div(span(span("a")), "b")
+    z2 = z.tagify()
+    assert z2 is not z and z2.children is not z.children
+    assert z2 == z
+    assert z2.children[0] is z.children[0]
+
+
+def test_tagify_after_modification():
+    # Whether a tree needs tagifying is cached, but modifying the tree anywhere must
+    # be noticed.
+    class Foo:
+        def tagify(self) -> Tag:
+            return span("foo")
+
+    inner = span("a")
+    middle = div(inner)
+    x = div(middle)
+    assert x.tagify().children[0] is middle
+
+    inner.append(Foo())
+    y = x.tagify()
+    assert y.children[0] is not middle
+    assert str(y) == str(div(div(span("a", span("foo")))))
+
+    inner.children[1] = "b"
+    assert x.tagify().children[0] is middle
+
+    middle.children += [Foo()]
+    assert str(x.tagify()) == str(div(div(span("a", "b"), span("foo"))))
+
+    inner.insert(0, HTMLDependency("a", "1.0"))
+    assert x.tagify().get_dependencies() == [HTMLDependency("a", "1.0")]
+    assert x.render()["dependencies"] == [HTMLDependency("a", "1.0")]
+
+
+def test_tagify_after_children_assignment():
+    # Replacing a tag's children (instead of modifying them) must also be noticed.
+    class Foo:
+        def tagify(self) -> Tag:
+            return span("foo")
+
+    inner = span("a")
+    outer = div(div(inner))
+    assert outer.tagify().children[0] is outer.children[0]
+
+    inner.children = TagList(Foo())
+    expected = str(div(div(span(span("foo")))))
+    assert outer.tagify().get_html_string() == expected
+    assert "".join(outer.iter_html()) == expected
+    assert str(outer) == expected
+
+    dep = HTMLDependency("a", "1.0")
+    inner.children = TagList(dep)
+    y = outer.tagify()
+    assert y.get_dependencies() == [dep]
+    assert y.get_dependencies()[0] is not dep
+
+    # A copied TagList doesn't share the cached result with the original.
+    z = div(span("a"))
+    assert z.tagify().children[0] is z.children[0]
+    z2 = copy.copy(z)
+    z2.children.data.append(Foo())
+    assert str(z2.tagify()) == str(div(span("a"), span("foo")))
 
 
 def test_tag_writing():
@@ -509,6 +690,306 @@ def test_tag_list_ws():
 #     )
 
 
+def test_iter_html():
+    dep = HTMLDependency("a", "1.0")
+    x = TagList(
+        div(span("a"), "b", dep, [div(str(i), class_="row") for i in range(50)]),
+        "<text>",
+        span(HTML("<b>c</b>")),
+    )
+    expected = x.render()["html"]
+
+    chunks = list(x.iter_html(chunk_size=100))
+    assert len(chunks) > 1
+    assert all(isinstance(chunk, str) for chunk in chunks)
+    assert "".join(chunks) == expected
+
+    # Every chunk except the last is at least `chunk_size` characters.
+    assert all(len(chunk) >= 100 for chunk in chunks[:-1])
+
+    # A single chunk, when the chunk size is larger than the document.
+    assert list(x.iter_html()) == [expected]
+
+    # Tag.iter_html()
+    y = cast_tag(x[0])
+    assert "".join(y.iter_html(chunk_size=1)) == y.render()["html"]
+
+    with pytest.raises(ValueError):
+        list(x.iter_html(chunk_size=0))
+
+
+def test_aiter_html():
+    x = div([span(str(i)) for i in range(100)])
+
+    async def collect(chunk_size: int) -> list[str]:
+        return [chunk async for chunk in x.aiter_html(chunk_size=chunk_size)]
+
+    chunks = asyncio.run(collect(50))
+    assert len(chunks) > 1
+    assert "".join(chunks) == x.render()["html"]
+
+    # Other tasks get to run between chunks.
+    async def interleaved() -> list[str]:
+        events: list[str] = []
+
+        async def other():
+            for _ in range(3):
+                events.append("other")
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(other())
+        async for _ in TagList(x).aiter_html(chunk_size=50):
+            events.append("chunk")
+        await task
+        return events
+
+    events = asyncio.run(interleaved())
+    assert events[:4] == ["chunk", "other", "chunk", "other"]
+
+    # Stopping early closes the underlying generator.
+    async def stop_early() -> str:
+        it = x.aiter_html(chunk_size=50)
+        first = await it.__anext__()
+        await it.aclose()
+        return first
+
+    assert x.render()["html"].startswith(asyncio.run(stop_early()))
+
+    # The tree isn't tagified up front, before the first chunk.
+    class Counter:
+        n = 0
+
+        def tagify(self) -> Tag:
+            Counter.n += 1
+            return span("c")
+
+    y = div([div(Counter()) for _ in range(100)])
+    expected = y.render()["html"]
+    Counter.n = 0
+
+    async def first_chunk() -> str:
+        it = y.aiter_html(chunk_size=50)
+        chunk = await it.__anext__()
+        await it.aclose()
+        return chunk
+
+    assert expected.startswith(asyncio.run(first_chunk()))
+    assert 0 < Counter.n < 100
+
+    # Documents have to be tagified before writing the <head>, but other tasks get to
+    # run while that happens.
+    doc = HTMLDocument(div([Counter() for _ in range(5000)]))
+
+    async def doc_events() -> list[str]:
+        events: list[str] = []
+
+        async def other():
+            while not events or events[-1] != "chunk":
+                events.append("other")
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(other())
+        async for _ in doc.aiter_html():
+            events.append("chunk")
+        await task
+        return events
+
+    events = asyncio.run(doc_events())
+    assert events.index("chunk") > 2
+
+
+def test_write_html():
+    x = TagList(div("caf\u00e9", [span(str(i)) for i in range(50)]), "<end>")
+    expected = x.render()["html"]
+
+    text = io.StringIO()
+    x.write_html(text, chunk_size=64)
+    assert text.getvalue() == expected
+
+    binary = io.BytesIO()
+    x.write_html(binary, chunk_size=64)
+    assert binary.getvalue() == expected.encode("utf-8")
+
+    binary = io.BytesIO()
+    cast_tag(x[0]).write_html(binary, encoding="latin-1")
+    assert binary.getvalue() == cast_tag(x[0]).render()["html"].encode("latin-1")
+
+    binary = io.BytesIO()
+    x.write_html(binary, chunk_size=64, encoding="utf-16")
+    assert binary.getvalue() == expected.encode("utf-16")
+
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+        x.write_html(gz)
+    assert gzip.decompress(buf.getvalue()) == expected.encode("utf-8")
+
+    with TemporaryDirectory() as tmpdir:
+        f = os.path.join(tmpdir, "out.html")
+        with open(f, "wb") as fh:
+            x.write_html(fh)
+        with open(f, "rb") as fh:
+            assert fh.read() == expected.encode("utf-8")
+
+
+def test_deeply_nested_tree():
+    # Walking the tree must not be limited by the recursion limit.
+    depth = sys.getrecursionlimit() + 100
+    dep = HTMLDependency("a", "1.0")
+    x = span("leaf", dep)
+    for _ in range(depth):
+        x = span(x, _add_ws=False)
+
+    assert x.get_dependencies() == [dep]
+    y = x.tagify()
+    assert y.get_dependencies() == [dep]
+    assert cast(HTMLDependency, y.get_dependencies()[0]) is not dep
+
+    html = str(x)
+    assert html == "<span>" * (depth + 1) + "leaf" + "</span>" * (depth + 1)
+    assert "".join(x.iter_html(chunk_size=100)) == html
+
+
+def test_render_single_pass():
+    # render() tagifies, writes HTML, and collects dependencies in one walk of the
+    # tree. The result should be the same as doing each of those separately.
+    a1 = HTMLDependency("a", "1.0")
+    a2 = HTMLDependency("a", "2.0")
+    b = HTMLDependency("b", "1.0")
+
+    class Text:
+        def tagify(self):
+            return "text"
+
+    class Deps:
+        def tagify(self):
+            return TagList(span(b), a1)
+
+    class MyTag(Tag):
+        def get_dependencies(self, *, dedup: bool = True):
+            return [a2]
+
+    tests = [
+        div(Text()),
+        div(a1, Text(), b),
+        TagList(Deps(), div(Deps(), span(a2)), b),
+        div(MyTag("span", a1), b, Deps()),
+        TagList(div(Deps(), _add_ws=False), "x", span(Text(), Text())),
+    ]
+    for x in tests:
+        cp = x.tagify()
+        res = x.render()
+        assert res["html"] == cp.get_html_string()
+        assert res["dependencies"] == cp.get_dependencies()
+        # Like tagify(), render() returns copies of the dependencies.
+        assert not any(d is dep for d in res["dependencies"] for dep in (a1, a2, b))
+
+    res = div(MyTag("span", a1), b).render()
+    assert res["dependencies"] == [a2, b]
+
+
+def test_freeze():
+    dep = HTMLDependency("a", "1.0")
+    n_tagified = 0
+
+    class Counter:
+        def tagify(self) -> Tag:
+            nonlocal n_tagified
+            n_tagified += 1
+            return span("counted")
+
+    def make_nav(*args: Any) -> Tag:
+        return div(tags.a("Home", href="/"), Counter(), dep, *args, class_="nav")
+
+    nav = make_nav()
+    frozen = nav.freeze()
+    assert n_tagified == 1
+    assert frozen.name == "div"
+    assert frozen.attrs == {"class": "nav"}
+    assert frozen.tagify() is frozen
+
+    # A frozen tag renders the same as the original, wherever it appears
+    for wrap in [
+        lambda x: x,
+        lambda x: div(x, "text"),
+        lambda x: span("a", x, "b"),
+        lambda x: div(div(span(x), x), _add_ws=False),
+        lambda x: TagList("a", x, x),
+    ]:
+        n_tagified = 0
+        expected = wrap(nav).render()
+        assert n_tagified > 0
+        assert str(wrap(frozen)) == str(wrap(nav))
+        n_tagified = 0
+        assert wrap(frozen).render() == expected
+        assert wrap(frozen).tagify().get_dependencies() == [dep]
+        assert "".join(wrap(frozen).iter_html(chunk_size=10)) == expected["html"]
+        assert n_tagified == 0
+
+    assert HTMLDocument(div(frozen)).render() == HTMLDocument(div(nav)).render()
+
+    # TagList.freeze() freezes each tag in the list
+    x = TagList("text", make_nav(), dep, make_nav("more")).freeze()
+    assert cast_tag(x[1]).tagify() is x[1]
+    assert cast_tag(x[3]).tagify() is x[3]
+    assert x.render() == TagList("text", make_nav(), dep, make_nav("more")).render()
+
+
+def test_minify():
+    x = div(
+        tags.input(type="checkbox", checked=""),
+        span("a  b", class_="x y"),
+        "  \n  ",
+        tags.pre("  keep\n  this"),
+        tags.textarea("  "),
+        tags.script("  "),
+        tags.p(" \n"),
+        id="main",
+        title='"q"',
+    )
+    assert x.get_html_string(minify=True) == (
+        "<div id=main title=&quot;q&quot;>"
+        "<input type=checkbox checked>"
+        '<span class="x y">a  b</span> '
+        "<pre>  keep\n  this</pre><textarea>  </textarea><script>  </script><p> </p>"
+        "</div>"
+    )
+    # The indent and eol arguments are ignored when minifying
+    assert x.get_html_string(2, "\r\n", minify=True) == x.get_html_string(minify=True)
+
+    # Minified output is the same as the regular output, apart from whitespace
+    # between tags.
+    nav = div(
+        h1("Title"),
+        TagList(span("one"), "two", div(a("three"), _add_ws=False)),
+        HTMLDependency("dep", "1.0"),
+    )
+    rendered = nav.render(minify=True)
+    assert rendered["dependencies"] == nav.render()["dependencies"]
+    assert rendered["html"] == "".join(str(nav).split())
+    assert TagList(nav, nav).get_html_string(minify=True) == rendered["html"] * 2
+    assert nav.freeze().render(minify=True) == rendered
+
+    doc = HTMLDocument(nav).render(minify=True)["html"]
+    assert doc.startswith("<!DOCTYPE html><html><head><meta charset=utf-8>")
+    assert "\n" not in doc
+
+    # Tag subclasses that override get_html_string() are passed `minify` if they take
+    # it, and otherwise are called the way they were before `minify` was added.
+    class Minifiable(Tag):
+        def get_html_string(
+            self, indent: int = 0, eol: str = "\n", *, minify: bool = False
+        ) -> str:
+            return "<min/>" if minify else "<full/>"
+
+    class Legacy(Tag):
+        def get_html_string(self, indent: int = 0, eol: str = "\n") -> str:
+            return "<legacy/>"
+
+    x = div(Minifiable("a"), Legacy("b"))
+    assert x.get_html_string(minify=True) == "<div><min/><legacy/></div>"
+    assert x.render(minify=True)["html"] == "<div><min/><legacy/></div>"
+
+
 def test_tag_repr():
     assert repr(div()) == str(div())
     assert repr(div("foo", "bar", id="id")) == str(div("foo", "bar", id="id"))
@@ -533,6 +1014,13 @@ def test_tag_escaping():
     assert str(tags.script("a && b", "x > 3")) == "<script>\n  a && bx > 3\n</script>"
     assert str(tags.script("a && b\nx > 3")) == "<script>a && b\nx > 3</script>"
     assert str(tags.style("a && b > 3")) == "<style>a && b > 3</style>"
+    # ...except for sequences that would end them early
+    assert str(tags.script("x = '</script><!--';")) == (
+        "<script>x = '<\\/script><!--';</script>"
+    )
+    assert str(tags.script("a", "</SCRIPT>")) == "<script>\n  a<\\/SCRIPT>\n</script>"
+    assert str(tags.style("p {}</style>")) == "<style>p {}<\\/style></style>"
+    assert str(tags.script(HTML("</script>"))) == "<script></script></script>"
 
 
 def test_html_save():
@@ -869,6 +1357,18 @@ def test_tag_normalize_attr():
     x = div(foo_bar="baz")
     assert x.attrs == {"foo-bar": "baz"}
 
+    # Attributes from dicts and kwargs are merged, in order
+    x = div({"class": "a", "id": "x"}, "text", {"class_": "b"}, class_="c", hidden=True)
+    assert x.attrs == {"class": "a b c", "id": "x", "hidden": ""}
+    assert list(x.children) == ["text"]
+    assert str(x) == '<div class="a b c" id="x" hidden="">text</div>'
+
+    # Values which are None or False are dropped, numbers are converted to strings
+    x = div(a=None, b=False, c=1, d=1.5, e=HTML("<"))
+    assert x.attrs == {"c": "1", "d": "1.5", "e": HTML("<")}
+    with pytest.raises(TypeError):
+        div(a=object())  # type: ignore
+
 
 def test_metadata_nodes_gone():
     # Make sure MetadataNodes don't result in a blank line.
@@ -898,6 +1398,133 @@ def test_repr_html():
         </div>""")
 
 
+def test_table_from_columns():
+    data = {"x": [1, 2.5, None], "y": ["a", "<b>", HTML("<i>c</i>")]}
+    dep = HTMLDependency("a", "1.0")
+    x = table_from_columns(data, tags.caption("Caption"), dep, class_="table")
+    expected = tags.table(
+        tags.caption("Caption"),
+        dep,
+        tags.thead(tags.tr(tags.th("x"), tags.th("y"))),
+        tags.tbody(*[tags.tr(tags.td(a), tags.td(b)) for a, b in zip(*data.values())]),
+        class_="table",
+    )
+    for minify in (False, True):
+        assert x.get_html_string(minify=minify) == expected.get_html_string(
+            minify=minify
+        )
+        assert div(div(x)).render(minify=minify) == div(div(expected)).render(
+            minify=minify
+        )
+    assert "".join(x.iter_html(chunk_size=10)) == str(expected)
+    assert str(x.tagify()) == str(expected)
+
+    expect_html(
+        table_from_columns({"x": (i for i in range(2))}, header=False),
+        textwrap.dedent("""\
+            <table>
+              <tbody>
+                <tr>
+                  <td>0</td>
+                </tr>
+                <tr>
+                  <td>1</td>
+                </tr>
+              </tbody>
+            </table>"""),
+    )
+    expect_html(
+        table_from_columns({}, header=False), "<table>\n  <tbody></tbody>\n</table>"
+    )
+
+    with pytest.raises(ValueError):
+        table_from_columns({"x": [1, 2], "y": [1]})
+
+
+def test_lazy_children():
+    class Tagifiable:
+        def tagify(self) -> TagList:
+            return TagList(span("tagified"), HTMLDependency("a", "1.0"))
+
+    def items(n: int):
+        for i in range(n):
+            yield tags.li(f"Item {i}", Tagifiable() if i == 1 else None)
+
+    expected = tags.ul(list(items(3)), tags.li("End"))
+    for render in (
+        lambda x: x.render(),
+        lambda x: x.render(minify=True),
+        lambda x: x.tagify().get_html_string(),
+        lambda x: "".join(x.iter_html(chunk_size=1)),
+        lambda x: TagList(x).render(),
+    ):
+        # Generators are wrapped in Lazy automatically
+        for x in (
+            tags.ul(items(3), tags.li("End")),
+            tags.ul(Lazy(items(3)), tags.li("End")),
+        ):
+            assert render(x) == render(expected)
+
+    # Children aren't generated until the HTML is written
+    generated: list[int] = []
+
+    def numbers():
+        for i in range(3):
+            generated.append(i)
+            yield i
+
+    x = div(numbers(), "a", Lazy([span("b"), [None, "c"]]))
+    x = x.tagify()
+    assert generated == []
+    assert str(x) == textwrap.dedent("""\
+        <div>
+          012a<span>b</span>c
+        </div>""")
+    assert generated == [0, 1, 2]
+
+    # Dependencies are collected by render(), but not get_dependencies()
+    x = div(Lazy([Tagifiable()]))
+    assert x.get_dependencies() == []
+    assert x.render()["dependencies"] == [HTMLDependency("a", "1.0")]
+
+
+def test_lazy_children_match_eager():
+    # Lazy children are written exactly like the same children given up front,
+    # including whether the tag's contents go on their own lines.
+    dep = HTMLDependency("a", "1.0")
+    cases: list[list[TagChild]] = [
+        [],
+        ["x"],
+        [HTML("<b>x</b>")],
+        ["x", "y"],
+        [span("x")],
+        [dep],
+        [dep, "x"],
+        ["x", dep, span("y")],
+        [Lazy([])],
+        [Lazy(["x"]), Lazy([])],
+    ]
+    for children in cases:
+        for lazy in (
+            div(Lazy(children)),
+            div(Lazy(children[:1]), Lazy(children[1:])),
+            div(Lazy([Lazy([c]) for c in children])),
+        ):
+            eager = div(*children)
+            assert str(lazy) == str(eager)
+            assert lazy.render(minify=True) == eager.render(minify=True)
+            assert "".join(lazy.iter_html(chunk_size=1)) == str(eager)
+            assert TagList(Lazy(children)).render() == TagList(*children).render()
+
+    assert str(div(Lazy([]))) == "<div></div>"
+    assert str(div(Lazy(["x"]))) == "<div>x</div>"
+
+    # Many Lazy siblings don't nest generators
+    n = sys.getrecursionlimit() + 100
+    x = div(*[Lazy(["x"]) for _ in range(n)])
+    assert str(x) == str(div(*["x"] * n))
+
+
 def test_types():
     # When a type checker like pyright is run on this file, this line will make sure
     # that a Tag function like `div()` matches the signature of the TagFunction Protocol
@@ -0,0 +1,118 @@
+import textwrap
+
+import pytest
+
+from htmltools import (
+    HTML,
+    HTMLDependency,
+    TagList,
+    Template,
+    a,
+    div,
+    slot,
+    span,
+    tags,
+)
+
+
+def test_template_fill():
+    item = Template(div(a(slot("label"), href=slot("url")), class_="item"))
+    assert item.slots == ("url", "label")
+
+    records = [
+        {"label": "Home", "url": "/"},
+        ("/a?b=1&c=2", "A & B"),
+        {"label": HTML("<b>Bold</b>"), "url": None},
+    ]
+    expected = TagList(
+        div(a("Home", href="/"), class_="item"),
+        div(a("A & B", href="/a?b=1&c=2"), class_="item"),
+        div(a(HTML("<b>Bold</b>"), href=""), class_="item"),
+    )
+    assert str(item.fill_many(records)) == str(expected)
+    assert str(item.fill_many(records)) == "\n".join(str(item.fill(r)) for r in records)
+    assert str(item.fill_many([])) == ""
+
+
+def test_template_record_separator():
+    # Records are separated the same way as the equivalent TagList's children
+    records = [{"x": "a"}, {"x": "b"}]
+    cases = [
+        (span(slot("x")), lambda x: span(x)),
+        (a(slot("x"), href="#"), lambda x: a(x, href="#")),
+        (TagList("Item ", slot("x")), lambda x: TagList("Item ", x)),
+        (TagList(span(slot("x")), "; "), lambda x: TagList(span(x), "; ")),
+        (TagList("Item ", div(slot("x"))), lambda x: TagList("Item ", div(x))),
+        (div(slot("x")), lambda x: div(x)),
+    ]
+    for content, make in cases:
+        expected = TagList(*[make(r["x"]) for r in records])
+        assert str(Template(content).fill_many(records)) == str(expected)
+        assert Template(content, minify=True).fill_many(records).get_html_string(
+            minify=True
+        ) == expected.get_html_string(minify=True)
+
+    assert (
+        str(Template(span(slot("x"))).fill_many(records))
+        == "<span>a</span><span>b</span>"
+    )
+    assert (
+        str(Template(TagList("Item ", slot("x"))).fill_many(records)) == "Item aItem b"
+    )
+
+
+def test_template_contexts():
+    dep = HTMLDependency("a", "1.0")
+    x = TagList(
+        span(slot("x"), " and ", slot("x"), title=f"{slot('y')} px"),
+        tags.script(slot("x")),
+        tags.style(slot("y")),
+        dep,
+    )
+    record = {"x": "</script> & <b>", "y": 1.5}
+    t = Template(x)
+    assert t.slots == ("y", "x")
+
+    expected = TagList(
+        span(record["x"], " and ", record["x"], title="1.5 px"),
+        tags.script(record["x"]),
+        tags.style(str(record["y"])),
+        dep,
+    )
+    assert t.fill(record).render() == expected.render()
+
+    t = Template(x, minify=True)
+    assert t.fill_many([record, record]).render() == {
+        "html": expected.get_html_string(minify=True) * 2,
+        "dependencies": [dep],
+    }
+
+
+def test_template_does_not_modify_content():
+    x = div(slot("x"), id=slot("y"))
+    Template(x)
+    assert x == div(slot("x"), id=slot("y"))
+
+
+def test_template_errors():
+    with pytest.raises(ValueError, match="identifier"):
+        slot("not a name")
+
+    with pytest.raises(ValueError, match="can't be filled"):
+        Template(div(HTML(slot("x"))))
+
+    t = Template(div(slot("x"), slot("y")))
+    with pytest.raises(ValueError, match="Expected 2 values"):
+        t.fill(("a",))
+    with pytest.raises(KeyError):
+        t.fill({"x": "a"})
+    # A string is a sequence, but not a record
+    with pytest.raises(TypeError, match="not str"):
+        t.fill("ab")
+    with pytest.raises(TypeError, match="not bytes"):
+        t.fill_many([b"ab"])
+
+    assert str(t.fill(("a", "b"))) == textwrap.dedent("""\
+        <div>
+          ab
+        </div>""")
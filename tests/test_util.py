@@ -1,9 +1,22 @@
+import sys
 from typing import Any, Dict, Union
 
 import pytest
 
-from htmltools import TagList, css, div, span
-from htmltools._util import flatten
+from htmltools import (
+    EscapeCache,
+    Style,
+    TagList,
+    css,
+    div,
+    html_escape,
+    html_escape_many,
+    set_escape_cache,
+    span,
+)
+from htmltools._core import TagAttrDict
+from htmltools._jsx import JSXTagAttrDict
+from htmltools._util import flatten, normalize_attr_name
 
 
 def test_css_type():
@@ -22,6 +35,117 @@ def test_css_type():
     pytest.raises(TypeError, css, collapse_=1, font_size="12px")
 
 
+def test_css():
+    assert css() is None
+    assert css(x=None) is None
+    assert css(fontSize=12, margin=["0", "auto"]) == "font-size:12;margin:0 auto;"
+    assert css("\n", a_b="1", cD="2") == "a-b:1;\nc-d:2;\n"
+    # A property which is declared again is moved to the end, since the declarations
+    # in between might set it too
+    assert css(margin_top="1px", margin="0", marginTop="5px") == (
+        "margin:0;margin-top:5px;"
+    )
+
+
+def test_style():
+    x = Style({"font_size": "12px", "color": None}, backgroundColor="red")
+    assert str(x) == "font-size:12px;background-color:red;"
+    assert repr(x) == "Style('font-size:12px;background-color:red;')"
+    assert len(x) == 2
+    assert x == Style(font_size="12px", background_color="red")
+    assert x != Style(background_color="red", font_size="12px")
+    assert str(Style({"a": 1}, a=2)) == "a:2;"
+    assert str(Style()) == ""
+
+    # Styles are added to tags like strings of CSS declarations
+    y = div(style="color: red;")
+    y.add_style(Style(color="blue", margin_top="1px"))
+    assert y.attrs["style"] == "color: red; color:blue;margin-top:1px;"
+    y.add_style(Style(color="green"), prepend=True)
+    assert y.attrs["style"] == "color:green; color: red; color:blue;margin-top:1px;"
+    y.add_style(Style())
+    assert y.attrs["style"] == "color:green; color: red; color:blue;margin-top:1px;"
+    assert str(div().add_style(Style(a="1"))) == '<div style="a:1;"></div>'
+
+
+def test_html_escape():
+    assert html_escape("plain text") == "plain text"
+    assert html_escape("<a href='x'>&\n") == "&lt;a href='x'&gt;&amp;\n"
+    assert html_escape("<a href='x'>&\r\n", attr=True) == (
+        "&lt;a href=&apos;x&apos;&gt;&amp;&#13;&#10;"
+    )
+    assert html_escape("<&>", context="text") == html_escape("<&>")
+    assert html_escape('"', attr=False, context="attr") == "&quot;"
+    assert html_escape("a b.html?x=1&y='2'\n", context="url") == (
+        "a%20b.html?x=1&amp;y=&apos;2&apos;%0A"
+    )
+    assert html_escape("if (a<b) '</script>'", context="script") == (
+        "if (a<b) '<\\/script>'"
+    )
+    assert html_escape("<!-- </Style>", context="style") == "<!-- <\\/Style>"
+
+    # Strings with nothing to escape are returned as-is
+    s = "x" * 100
+    for context in ("text", "attr", "url", "script", "style"):
+        assert html_escape(s, context=context) is s
+
+    with pytest.raises(ValueError):
+        html_escape("x", context="css")  # type: ignore
+
+
+def test_html_escape_many():
+    x = ["plain", "a < b & c", "", "'x'\n", "\x00<"]
+    for context in (None, "text", "attr", "url", "script", "style"):
+        for attr in (False, True):
+            assert html_escape_many(iter(x), attr, context=context) == [
+                html_escape(s, attr, context=context) for s in x
+            ]
+
+    assert html_escape_many([]) == []
+    assert html_escape_many(["a", "b"]) == ["a", "b"]
+
+
+def test_escape_cache():
+    cache = EscapeCache(maxsize=2, max_length=10)
+    old = set_escape_cache(cache)
+    # There's no cache by default
+    assert old is None
+    try:
+        assert html_escape("<b>") == "&lt;b&gt;"
+        assert html_escape("<b>") == "&lt;b&gt;"
+        assert html_escape('"x"', attr=True) == "&quot;x&quot;"
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.hit_rate == 1 / 3
+
+        # Long strings aren't cached
+        assert html_escape("<" * 11) == "&lt;" * 11
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+        # The oldest entry is evicted when full
+        html_escape("a")
+        html_escape("b")
+        html_escape("<b>")
+        assert (cache.hits, cache.misses, len(cache)) == (1, 5, 3)
+
+        # (A tag's attributes are only escaped the first time it's rendered, so new
+        # tags are rendered here.)
+        assert str(div("a & b", class_="a&b")) == '<div class="a&amp;b">a &amp; b</div>'
+        assert str(div("a & b", class_="a&b")) == '<div class="a&amp;b">a &amp; b</div>'
+        assert cache.hits == 3
+
+        cache.clear()
+        assert (cache.hits, cache.misses, len(cache), cache.hit_rate) == (0, 0, 0, 0)
+
+        set_escape_cache(None)
+        assert html_escape("<b>") == "&lt;b&gt;"
+        assert cache.misses == 0
+    finally:
+        set_escape_cache(old)
+
+    with pytest.raises(ValueError):
+        EscapeCache(maxsize=0)
+
+
 def test_flatten():
     assert flatten([[]]) == []
     assert flatten([1, [2], ["3", [4, None, 5, div(div()), div()]]]) == [
@@ -58,3 +182,37 @@ def test_flatten():
     x2: list[Any] = [0, TagList(1, 2, div(), TagList(span(div()), span())), (3, 4)]
     assert list(flatten(x2)) == [0, "1", "2", div(), span(div()), span(), 3, 4]
     assert flatten([1, [TagList("2"), 3], 4]) == [1, "2", 3, 4]
+
+    # Deeply nested lists don't hit the recursion limit
+    deep: list[Any] = ["a"]
+    for _ in range(5000):
+        deep = [deep, None]
+    assert flatten(deep) == ["a"]
+    assert list(TagList(deep)) == ["a"]
+
+
+def test_taglist_normalize():
+    assert list(TagList()) == []
+    assert list(TagList("a")) == ["a"]
+    assert list(TagList(None)) == []
+    assert list(
+        TagList(1, None, [2.5, ("a", [TagList("b", 3)], [])], True, span("c"))
+    ) == ["1", "2.5", "a", "b", "3", "True", span("c")]
+    with pytest.raises(TypeError):
+        TagList(["a", object()])  # type: ignore
+
+
+def test_normalize_attr_name():
+    assert normalize_attr_name("class_") == "class"
+    assert normalize_attr_name("foo_Bar_") == "foo-Bar"
+    assert normalize_attr_name("x__") == "x-"
+    assert normalize_attr_name("id") == "id"
+    assert normalize_attr_name("") == ""
+
+    # Names are cached and interned, and shared by HTML and JSX tags
+    nm = normalize_attr_name("".join(["data_", "row"]))
+    assert nm == "data-row"
+    assert nm is normalize_attr_name("data_row")
+    assert nm is sys.intern("data-row")
+    assert TagAttrDict._normalize_attr_name is normalize_attr_name
+    assert JSXTagAttrDict._normalize_attr_name is normalize_attr_name